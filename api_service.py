@@ -0,0 +1,300 @@
+"""JSON API for the impact, entry and defense models: python api_service.py [--port 8000] [--workers 4]
+
+POST bodies are batches: either an object of equal-length columns (scalar
+columns broadcast) or a list of row objects. Unknown field names are
+rejected and null takes the field's default. Each batch is evaluated in one
+vectorized pass and answered as columns. Send Accept: application/x-ndjson
+(or ?format=ndjson) to stream one JSON row per line instead, computed and
+sent chunk by chunk.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from crater_scaling import DEFAULT_PROJECTILE_DENSITY, PROJECTILE_DENSITIES, TARGET_MATERIALS
+from ensemble import neo_uncertainty_ranges
+from impact_models import (DEFENSE_BASE_SUCCESS, calculate_defense_success_batch, calculate_impact_effects,
+                           calculate_impact_with_entry)
+
+MAX_BODY_BYTES = 64 * 2 ** 20
+MAX_BATCH_ROWS = 500_000
+STREAM_CHUNK_ROWS = 8192
+NDJSON = 'application/x-ndjson'
+
+# name -> (type, default); a default of None makes the field required
+IMPACT_FIELDS = {
+    'diameter': (float, None),  # m
+    'velocity': (float, None),  # km/s
+    'angle': (float, 45.0),  # degrees from horizontal
+    'material': (str, "Ocean"),
+    'density': (float, float(DEFAULT_PROJECTILE_DENSITY))  # kg/m³
+}
+DEFENSE_FIELDS = {
+    'strategy': (str, None),
+    'asteroid_size': (float, None),  # m
+    'warning_time': (float, None)  # years
+}
+# name -> (low, high, whether low itself is allowed)
+FIELD_BOUNDS = {
+    'diameter': (0.0, np.inf, False),
+    'velocity': (0.0, np.inf, False),
+    'angle': (0.0, 90.0, False),
+    'density': (0.0, np.inf, False),
+    'asteroid_size': (0.0, np.inf, True),
+    'warning_time': (0.0, np.inf, True)
+}
+FIELD_CHOICES = {
+    'material': TARGET_MATERIALS,
+    'strategy': DEFENSE_BASE_SUCCESS
+}
+
+def _field_array(name, kind, values):
+    if np.ndim(values) > 1:
+        raise ValueError(f"'{name}' must be a value or a flat list of values")
+    items = values if isinstance(values, list) else [values]
+    if kind is str:
+        if not all(isinstance(v, str) for v in items):
+            raise ValueError(f"'{name}' must be a string or a list of strings")
+        unknown = set(items) - set(FIELD_CHOICES[name])
+        if unknown:
+            raise ValueError(f"Unknown {name} {sorted(unknown)[0]!r}; "
+                             f"expected one of {', '.join(FIELD_CHOICES[name])}")
+        return np.asarray(values, dtype=object)
+    # JSON numbers only: true/false and numeric strings would otherwise coerce to floats
+    if not all(type(v) is float or type(v) is int for v in items):
+        raise ValueError(f"'{name}' must be a number or a list of numbers")
+    values = np.asarray(values, dtype=float)
+    low, high, inclusive = FIELD_BOUNDS[name]
+    outside = ~np.isfinite(values) | (values > high) | ((values < low) if inclusive else (values <= low))
+    if outside.any():
+        raise ValueError(f"'{name}' must be {'>=' if inclusive else '>'} {low:g}"
+                         + (f" and <= {high:g}" if np.isfinite(high) else ""))
+    return values
+
+def _check_names(names, fields):
+    unknown = set(names) - set(fields)
+    if unknown:
+        raise ValueError(f"Unknown field {sorted(unknown)[0]!r}; expected {', '.join(fields)}")
+
+def parse_batch(body, fields):
+    """Validated, equally shaped column arrays from a batch body; returns (columns, rows)
+
+    Unknown field names are rejected; null (or a missing field) takes the
+    field's default where it has one.
+    """
+    if isinstance(body, list):
+        if not all(isinstance(row, dict) for row in body):
+            raise ValueError("A list body must hold one object per row")
+        _check_names(set().union(*body), fields)
+        rows = len(body)
+        body = {name: [row.get(name) for row in body] for name in fields}
+    elif isinstance(body, dict):
+        _check_names(body, fields)
+        lengths = {len(value) for value in body.values() if isinstance(value, list)}
+        if len(lengths) > 1:
+            raise ValueError("Columns must all have the same length")
+        rows = lengths.pop() if lengths else 1
+    else:
+        raise ValueError("Expected a JSON object of columns or a list of row objects")
+    if rows > MAX_BATCH_ROWS:
+        raise ValueError(f"Batches are limited to {MAX_BATCH_ROWS:,} rows")
+
+    columns = {}
+    for name, (kind, default) in fields.items():
+        value = body.get(name)
+        if isinstance(value, list) and None in value:
+            if default is None:
+                raise ValueError(f"'{name}' is required")
+            value = [default if v is None else v for v in value]
+        elif value is None:
+            if default is None:
+                raise ValueError(f"'{name}' is required")
+            value = default
+        columns[name] = np.broadcast_to(_field_array(name, kind, value), (rows,))
+    return columns, rows
+
+def impact_batch(columns, entry=False):
+    """calculate_impact_effects (or the entry-aware model) over one batch of columns"""
+    model = calculate_impact_with_entry if entry else calculate_impact_effects
+    material = columns['material']
+    # A single material keeps the cached scalar scaling row
+    if material.size and (material == material[0]).all():
+        material = material[0]
+    return model(columns['diameter'], columns['velocity'], columns['angle'], material, columns['density'])
+
+def defense_batch(columns, rng):
+    """calculate_defense_success_batch per strategy, scattered back into batch order"""
+    rows = columns['strategy'].shape[0]
+    success_rate = np.empty(rows)
+    miss_distance = np.empty(rows)
+    for strategy in np.unique(columns['strategy']).tolist():
+        rows_for = np.flatnonzero(columns['strategy'] == strategy)
+        success_rate[rows_for], miss_distance[rows_for] = calculate_defense_success_batch(
+            strategy, columns['asteroid_size'][rows_for], columns['warning_time'][rows_for], rng)
+    return {'success_rate': success_rate, 'miss_distance': miss_distance}
+
+def normalize_neo_feed(body):
+    """NEO objects from a NASA feed (or a plain list of feed objects) as flat columns
+
+    Returns the columns and the number of malformed objects skipped.
+    """
+    if isinstance(body, dict) and isinstance(body.get('near_earth_objects'), dict):
+        objects = [(date, obj) for date, day_objects in body['near_earth_objects'].items() for obj in day_objects]
+    elif isinstance(body, list):
+        objects = [(None, obj) for obj in body]
+    else:
+        raise ValueError("Expected a NASA NEO feed or a list of feed objects")
+
+    rows = []
+    for date, obj in objects:
+        try:
+            ranges = neo_uncertainty_ranges(obj)
+            approach = obj['close_approach_data'][0]
+        except (KeyError, ValueError, IndexError, TypeError):
+            continue
+        rows.append((str(obj.get('id', '')), ranges['name'], bool(obj.get('is_potentially_hazardous_asteroid', False)),
+                     ranges['diameter_min'], ranges['diameter_max'], ranges['velocity'], ranges['miss_distance'],
+                     approach.get('close_approach_date', date)))
+    if len(rows) > MAX_BATCH_ROWS:
+        raise ValueError(f"Batches are limited to {MAX_BATCH_ROWS:,} rows")
+    names = ('id', 'name', 'hazardous', 'diameter_min', 'diameter_max', 'velocity', 'miss_distance', 'approach_date')
+    return dict(zip(names, map(list, zip(*rows)) if rows else ([] for _ in names))), len(objects) - len(rows)
+
+def _column_lists(result, rows):
+    """Plain lists per column (nested dicts kept nested), with non-finite floats as null"""
+    columns = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            columns[key] = _column_lists(value, rows)
+            continue
+        if isinstance(value, list):
+            columns[key] = value
+            continue
+        value = np.broadcast_to(value, (rows,))
+        if value.dtype.kind == 'f' and not np.isfinite(value).all():
+            value = np.where(np.isfinite(value), value, None)
+        columns[key] = value.tolist()
+    return columns
+
+def _row_dicts(columns):
+    """Transpose columns (nested dicts included) into one dict per row"""
+    names = list(columns)
+    series = [_row_dicts(value) if isinstance(value, dict) else value for value in columns.values()]
+    return [dict(zip(names, values)) for values in zip(*series)]
+
+def _dumps(payload):
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+def _wants_stream(request):
+    return request.query_params.get('format') == 'ndjson' or NDJSON in request.headers.get('accept', '')
+
+def _flag(request, name):
+    return request.query_params.get(name, '').lower() in ('1', 'true', 'yes')
+
+def _error(message, status=400):
+    return JSONResponse({'error': message}, status_code=status)
+
+async def _read_json(request):
+    if int(request.headers.get('content-length') or 0) > MAX_BODY_BYTES:
+        raise ValueError(f"Request bodies are limited to {MAX_BODY_BYTES // 2 ** 20} MiB")
+    body = await request.body()
+    if len(body) > MAX_BODY_BYTES:
+        raise ValueError(f"Request bodies are limited to {MAX_BODY_BYTES // 2 ** 20} MiB")
+    try:
+        return await run_in_threadpool(json.loads, body)
+    except ValueError:
+        raise ValueError("Request body is not valid JSON") from None
+
+async def _respond(request, rows, compute, header=None):
+    """Columns as one JSON document, or NDJSON rows computed and sent STREAM_CHUNK_ROWS at a time
+
+    compute(start, stop) evaluates one slice of the batch; the CPU-bound work
+    runs off the event loop either way.
+    """
+    if _wants_stream(request):
+        def lines():
+            for start in range(0, rows, STREAM_CHUNK_ROWS):
+                stop = min(start + STREAM_CHUNK_ROWS, rows)
+                chunk = _row_dicts(_column_lists(compute(start, stop), stop - start))
+                yield b''.join(_dumps(row) + b'\n' for row in chunk)
+        # Starlette iterates a plain generator in its thread pool
+        return StreamingResponse(lines(), media_type=NDJSON)
+
+    document = lambda: _dumps({**(header or {}), 'count': rows, 'results': _column_lists(compute(0, rows), rows)})
+    return Response(await run_in_threadpool(document), media_type='application/json')
+
+def _sliced(columns, start, stop):
+    return {name: values[start:stop] for name, values in columns.items()}
+
+async def impact(request):
+    try:
+        columns, rows = parse_batch(await _read_json(request), IMPACT_FIELDS)
+    except ValueError as exc:
+        return _error(str(exc))
+    entry = _flag(request, 'entry')
+    return await _respond(request, rows, lambda start, stop: impact_batch(_sliced(columns, start, stop), entry))
+
+async def defense(request):
+    try:
+        columns, rows = parse_batch(await _read_json(request), DEFENSE_FIELDS)
+        seed = request.query_params.get('seed')
+        if seed is not None and not seed.isdigit():
+            raise ValueError("'seed' must be a non-negative integer")
+        rng = np.random.default_rng(None if seed is None else int(seed))
+    except ValueError as exc:
+        return _error(str(exc))
+    return await _respond(request, rows, lambda start, stop: defense_batch(_sliced(columns, start, stop), rng))
+
+async def normalize_neo(request):
+    try:
+        columns, skipped = normalize_neo_feed(await _read_json(request))
+    except ValueError as exc:
+        return _error(str(exc))
+    return await _respond(request, len(columns['id']), lambda start, stop: _sliced(columns, start, stop),
+                          {'skipped': skipped})
+
+async def models(request):
+    """The inputs each model accepts, with their defaults and allowed values"""
+    fields = lambda spec: {name: {'type': 'string' if kind is str else 'number', 'default': default}
+                           for name, (kind, default) in spec.items()}
+    return JSONResponse({
+        'impact': {'fields': fields(IMPACT_FIELDS), 'options': {'entry': "simulate atmospheric entry first"}},
+        'defense': {'fields': fields(DEFENSE_FIELDS), 'options': {'seed': "seed for the miss-distance draw"}},
+        'materials': TARGET_MATERIALS,
+        'projectile_densities': PROJECTILE_DENSITIES,
+        'defense_strategies': DEFENSE_BASE_SUCCESS,
+        'max_batch_rows': MAX_BATCH_ROWS,
+        'stream_chunk_rows': STREAM_CHUNK_ROWS
+    })
+
+async def health(request):
+    return JSONResponse({'status': 'ok', 'pid': os.getpid()})
+
+app = Starlette(routes=[
+    Route('/health', health),
+    Route('/models', models),
+    Route('/impact', impact, methods=['POST']),
+    Route('/defense', defense, methods=['POST']),
+    Route('/neo/normalize', normalize_neo, methods=['POST'])
+])
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1), help="worker processes")
+    args = parser.parse_args(argv)
+    # Workers are separate processes, so they load the app by import path
+    uvicorn.run("api_service:app", host=args.host, port=args.port, workers=args.workers,
+                app_dir=os.path.dirname(os.path.abspath(__file__)), log_level='warning')
+
+if __name__ == "__main__":
+    main()
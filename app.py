@@ -5,9 +5,26 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 from datetime import datetime, timedelta
+from functools import partial
+import os
 import time
 import random
 
+from atmospheric_entry import simulate_atmospheric_entry
+from charts import binned_histogram_trace, compact_figure, figure_payload_bytes, scatter_gl_traces
+from crater_scaling import PROJECTILE_DENSITIES
+from ensemble import neo_uncertainty_ranges, run_uncertainty_ensemble
+from impact_models import DEFENSE_BASE_SUCCESS
+from neo_search import build_trigrams, index_catalog, index_neo_feed, query_index
+from orbit_animation import ANIMATION_BYTE_BUDGET, build_orbit_animation, feed_orbits, orbit_track_positions
+from refresh_scheduler import latest, refresh_stats, register_source, request_refresh
+from report_generator import request_report
+from result_cache import (cache_stats, cached_defense_success, cached_impact_distribution_figure,
+                          cached_impact_with_entry)
+from sbdb_catalog import catalog_impact_effects, catalog_summary, load_catalog, orbit_positions
+from synthetic_feeds import synthetic_neo_feed, synthetic_usgs_feed
+from tsunami import load_bathymetry, simulate_impact_tsunami, synthetic_bathymetry
+
 # Page configuration
 st.set_page_config(
     page_title="Meteor Madness - NASA Space Apps 2025",
@@ -160,6 +177,17 @@ def setup_secrets():
 
 NASA_API_KEY = setup_secrets()
 
+NEO_FEED_URL = "https://api.nasa.gov/neo/rest/v1/feed"
+USGS_FEED_URL = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/4.5_week.geojson"
+USGS_EVENT_LIMIT = 15  # most recent events shown; the USGS_EVENT_LIMIT setting overrides it
+
+def secret_setting(key, default):
+    """Optional setting from secrets, cast to the type of its default"""
+    try:
+        return type(default)(st.secrets[key])
+    except:
+        return default
+
 def navigation():
     st.markdown("""
     <div class="nasa-navbar">
@@ -178,173 +206,268 @@ def create_metric_card(title, value, subtitle, icon):
     </div>
     """, unsafe_allow_html=True)
 
-def generate_simulated_neo_data():
+def render_chart(fig, name):
+    """Render a compacted Plotly figure and record its payload for this rerun"""
+    # Dicts are specs that were already compacted (e.g. cached figures)
+    spec = fig if isinstance(fig, dict) else compact_figure(fig)
+    st.session_state.payload_bytes[name] = figure_payload_bytes(spec)
+    st.plotly_chart(spec, use_container_width=True)
+
+def show_payload_stats():
+    """Sidebar report of figure bytes sent per chart and per rerun"""
+    figure_bytes = st.session_state.payload_bytes
+    rerun_total = sum(figure_bytes.values())
+    history = st.session_state.payload_history
+    history.append(rerun_total)
+    del history[:-20]
+    
+    with st.sidebar.expander("📦 CHART PAYLOAD", expanded=False):
+        st.metric("This Rerun", f"{rerun_total / 1024:,.1f} KB", f"{len(figure_bytes)} figures", delta_color="off")
+        st.metric("Average Rerun", f"{sum(history) / len(history) / 1024:,.1f} KB", f"last {len(history)} reruns", delta_color="off")
+        st.dataframe(
+            pd.DataFrame({
+                'Figure': list(figure_bytes.keys()),
+                'KB': [size / 1024 for size in figure_bytes.values()]
+            }).sort_values('KB', ascending=False).style.format({'KB': '{:,.1f}'}),
+            use_container_width=True,
+            hide_index=True
+        )
+
+def show_cache_stats():
+    """Sidebar report of the shared result caches"""
+    with st.sidebar.expander("🧠 RESULT CACHE", expanded=False):
+        stats = cache_stats()
+        st.dataframe(
+            pd.DataFrame([
+                {'Cache': name, 'Hit Rate': s['hit_rate'], 'Hits': s['hits'], 'Misses': s['misses'],
+                 'Entries': f"{s['size']}/{s['max_size']}"}
+                for name, s in stats.items()
+            ]).style.format({'Hit Rate': '{:.0%}'}),
+            use_container_width=True,
+            hide_index=True
+        )
+
+def generate_simulated_neo_data(count=38, seed=None):
     """Generate simulated NEO data when API fails"""
-    asteroids = {}
-    for i in range(7):
-        date = (datetime.now() + timedelta(days=i)).strftime('%Y-%m-%d')
-        asteroids[date] = [
-            {
-                'id': f"sim_{i}_{j}",
-                'name': f"Simulated Asteroid {i}-{j}",
-                'estimated_diameter': {'meters': {'estimated_diameter_min': random.randint(50, 500)}},
-                'is_potentially_hazardous_asteroid': random.choice([True, False]),
-                'close_approach_data': [{
-                    'miss_distance': {'kilometers': str(random.randint(5000000, 50000000))},
-                    'relative_velocity': {'kilometers_per_second': str(random.uniform(5, 25))}
-                }]
-            } for j in range(random.randint(3, 8))
-        ]
-    return {'element_count': 127, 'near_earth_objects': asteroids}
-
-def fetch_live_neo_data(days=7):
-    """Fetch live data from NASA NEO API"""
-    try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        url = "https://api.nasa.gov/neo/rest/v1/feed"
-        params = {
-            'start_date': start_date.strftime('%Y-%m-%d'),
-            'end_date': end_date.strftime('%Y-%m-%d'),
-            'api_key': NASA_API_KEY
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                'success': True,
-                'data': data,
-                'count': data.get('element_count', 127)
-            }
-        else:
-            simulated_data = generate_simulated_neo_data()
-            return {
-                'success': False,
-                'data': simulated_data,
-                'count': simulated_data['element_count']
-            }
-            
-    except Exception as e:
-        simulated_data = generate_simulated_neo_data()
-        return {
-            'success': False,
-            'data': simulated_data,
-            'count': simulated_data['element_count']
-        }
-
-def generate_simulated_earthquake_data():
-    """Generate simulated earthquake data with coordinates"""
-    locations = [
-        {"place": "California, USA", "lat": 36.7783, "lon": -119.4179},
-        {"place": "Tokyo, Japan", "lat": 35.6762, "lon": 139.6503},
-        {"place": "Indonesia", "lat": -0.7893, "lon": 113.9213},
-        {"place": "Chile", "lat": -35.6751, "lon": -71.5430},
-        {"place": "Italy", "lat": 41.8719, "lon": 12.5674},
-        {"place": "New Zealand", "lat": -40.9006, "lon": 174.8860},
-        {"place": "Greece", "lat": 39.0742, "lon": 21.8243},
-        {"place": "Turkey", "lat": 38.9637, "lon": 35.2433},
-        {"place": "Mexico", "lat": 23.6345, "lon": -102.5528},
-        {"place": "Philippines", "lat": 12.8797, "lon": 121.7740},
-        {"place": "Alaska, USA", "lat": 64.2008, "lon": -149.4937},
-        {"place": "Peru", "lat": -9.1900, "lon": -75.0152},
-        {"place": "India", "lat": 20.5937, "lon": 78.9629},
-        {"place": "Iran", "lat": 32.4279, "lon": 53.6880},
-        {"place": "Papua New Guinea", "lat": -6.3150, "lon": 143.9555}
-    ]
+    return synthetic_neo_feed(count, days=7, seed=seed)
+
+def fetch_live_neo_data(days=7, url=NEO_FEED_URL):
+    """Fetch live data from NASA NEO API, raising on failure"""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    
+    params = {
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'api_key': NASA_API_KEY
+    }
     
+    response = requests.get(url, params=params, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    return {
+        'success': True,
+        'data': data,
+        'count': data.get('element_count', 127)
+    }
+
+def simulated_neo_feed():
+    """Simulated NEO feed in the shape fetch_live_neo_data returns"""
+    simulated_data = generate_simulated_neo_data()
+    return {
+        'success': False,
+        'data': simulated_data,
+        'count': simulated_data['element_count']
+    }
+
+def parse_usgs_earthquakes(data, limit=USGS_EVENT_LIMIT):
+    """Earthquake records with coordinates from a USGS GeoJSON summary feed"""
     earthquakes = []
-    for loc in locations:
+    for feature in data['features'][:limit]:
+        eq = feature['properties']
+        coords = feature['geometry']['coordinates']
         earthquakes.append({
-            'magnitude': round(random.uniform(4.5, 7.5), 1),
-            'place': loc['place'],
-            'time': datetime.now() - timedelta(days=random.randint(0, 6)),
-            'depth': round(random.uniform(5, 100), 1),
-            'latitude': loc['lat'],
-            'longitude': loc['lon'],
-            'significance': random.randint(100, 800)
+            'magnitude': eq['mag'],
+            'place': eq['place'],
+            'time': datetime.fromtimestamp(eq['time']/1000),
+            'depth': coords[2],
+            'longitude': coords[0],
+            'latitude': coords[1],
+            'significance': eq.get('sig', 0)
         })
-    
     return earthquakes
 
-def fetch_usgs_earthquake_data():
-    """Fetch earthquake data from USGS with coordinates"""
-    try:
-        url = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/4.5_week.geojson"
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            earthquakes = []
-            for feature in data['features'][:15]:
-                eq = feature['properties']
-                coords = feature['geometry']['coordinates']
-                earthquakes.append({
-                    'magnitude': eq['mag'],
-                    'place': eq['place'],
-                    'time': datetime.fromtimestamp(eq['time']/1000),
-                    'depth': coords[2],
-                    'longitude': coords[0],
-                    'latitude': coords[1],
-                    'significance': eq.get('sig', 0)
-                })
-            return earthquakes
-        return generate_simulated_earthquake_data()
-    except:
-        return generate_simulated_earthquake_data()
-
-def calculate_defense_success(defense_strategy, asteroid_size, warning_time):
-    """Calculate defense success probability"""
-    base_success = {
-        "Kinetic Impactor": 0.85,
-        "Gravity Tractor": 0.70,
-        "Nuclear Option": 0.95
-    }
+def generate_simulated_earthquake_data(count=USGS_EVENT_LIMIT, seed=None):
+    """Generate simulated earthquake data with coordinates"""
+    return parse_usgs_earthquakes(synthetic_usgs_feed(count, seed=seed), limit=count)
+
+def fetch_usgs_earthquake_data(url=USGS_FEED_URL, limit=USGS_EVENT_LIMIT):
+    """Fetch earthquake data from USGS with coordinates, raising on failure"""
+    response = requests.get(url, timeout=10)
+    response.raise_for_status()
+    return parse_usgs_earthquakes(response.json(), limit=limit)
+
+@st.cache_resource(show_spinner=False)
+def start_data_refresh():
+    """Start the background refresh of the NEO and USGS feeds once per process"""
+    # Settings are read here, in the script thread; the refresh threads only see the bound values
+    register_source('neo', partial(fetch_live_neo_data, url=secret_setting("NEO_FEED_URL", NEO_FEED_URL)),
+                    secret_setting("NEO_REFRESH_SECONDS", 900.0), fallback=simulated_neo_feed)
+    register_source('usgs', partial(fetch_usgs_earthquake_data, url=secret_setting("USGS_FEED_URL", USGS_FEED_URL),
+                                    limit=secret_setting("USGS_EVENT_LIMIT", USGS_EVENT_LIMIT)),
+                    secret_setting("USGS_REFRESH_SECONDS", 300.0), fallback=generate_simulated_earthquake_data)
+
+def show_refresh_stats():
+    """Sidebar report of the background data refresh"""
+    with st.sidebar.expander("🛰️ DATA REFRESH", expanded=False):
+        format_time = lambda t: datetime.fromtimestamp(t).strftime("%H:%M:%S") if t else "—"
+        stats = refresh_stats()
+        st.dataframe(
+            pd.DataFrame([
+                {'Source': name.upper(), 'Live': s['live'], 'Last Refresh': format_time(s['last_refresh']),
+                 'Duration (s)': s['last_duration'], 'Failures': s['failures'],
+                 'Ignored Requests': s['requests_ignored'],
+                 'Next Refresh': format_time(s['next_refresh']), 'Version': s['version']}
+                for name, s in stats.items()
+            ]).style.format({'Duration (s)': '{:.2f}'}, na_rep="—"),
+            use_container_width=True,
+            hide_index=True
+        )
+        for name, s in stats.items():
+            if s['last_error']:
+                st.caption(f"{name.upper()}: {s['last_error']}")
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def run_cached_ensemble(ranges, material, defense_strategy, warning_time, clones, seed):
+    """Cache ensemble runs per object and parameter set"""
+    return run_uncertainty_ensemble(ranges, material, defense_strategy, warning_time, clones=clones, seed=seed)
+
+def create_uncertainty_ensemble(neo_data, material):
+    """Uncertainty ensemble of virtual clones for a single NEO"""
+    st.markdown("### 🎲 UNCERTAINTY ENSEMBLE")
+    
+    candidates = {}
+    for date, objects in neo_data['near_earth_objects'].items():
+        for obj in objects:
+            try:
+                ranges = neo_uncertainty_ranges(obj)
+                candidates[ranges['name']] = ranges
+            except (KeyError, ValueError, IndexError):
+                continue
     
-    size_factor = max(0.1, 1 - (asteroid_size / 2000))
-    time_factor = min(1.0, warning_time / 10)
+    if not candidates:
+        st.info("No near-Earth objects available for ensemble propagation")
+        return
     
-    success_rate = base_success[defense_strategy] * size_factor * time_factor
-    success_rate = min(0.98, max(0.3, success_rate))
+    col1, col2 = st.columns([1, 2])
     
-    miss_distance = random.randint(5000, 50000) * (success_rate / 0.85)
+    with col1:
+        name = st.selectbox("Near-Earth Object", sorted(candidates), key="ensemble_object")
+        clones = st.select_slider("Virtual Clones", options=[1000, 10000, 50000, 100000], value=100000)
+        defense_strategy = st.selectbox("Defense Strategy", list(DEFENSE_BASE_SUCCESS), key="ensemble_strategy")
+        warning_time = st.slider("Warning Time (years)", 1, 20, 5, key="ensemble_warning")
+        
+        if st.button("🎲 RUN ENSEMBLE", use_container_width=True):
+            st.session_state.run_ensemble = True
     
-    return success_rate, miss_distance
+    with col2:
+        if st.session_state.get('run_ensemble', False):
+            ranges = candidates[name]
+            with st.spinner(f"Propagating {clones:,} virtual clones..."):
+                start = time.perf_counter()
+                result = run_cached_ensemble(ranges, material, defense_strategy, warning_time, clones, seed=0)
+                elapsed = time.perf_counter() - start
+            
+            metrics = result['metrics']
+            st.markdown(f"""
+            <div class="data-card">
+                <h3 style="color: #FC3D21;">🎲 {result['name']} - {result['clones']:,} CLONES</h3>
+                <p><strong>Diameter Range:</strong> {ranges['diameter_min']:,.0f} - {ranges['diameter_max']:,.0f} meters</p>
+                <p><strong>Energy (5-50-95%):</strong> {metrics['energy_megatons']['p5']:,.1f} / {metrics['energy_megatons']['p50']:,.1f} / {metrics['energy_megatons']['p95']:,.1f} megatons TNT</p>
+                <p><strong>Crater Diameter (5-50-95%):</strong> {metrics['crater_diameter']['p5']:,.0f} / {metrics['crater_diameter']['p50']:,.0f} / {metrics['crater_diameter']['p95']:,.0f} meters</p>
+                <p><strong>Seismic Magnitude (median):</strong> {metrics['seismic_magnitude']['p50']:.1f} Richter</p>
+                <p><strong>Defense Success (mean):</strong> {metrics['defense_success']['mean']:.1%}</p>
+                <p><strong>Clones within 0.05 AU:</strong> {result['pha_distance_fraction']:.1%}</p>
+                <p><strong>Compute Time:</strong> {elapsed:.2f} s</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            metric_key = st.radio("Outcome Distribution", ["energy_megatons", "crater_diameter", "seismic_magnitude", "defense_success"],
+                                  horizontal=True, key="ensemble_metric")
+            edges = metrics[metric_key]['edges']
+            fig = go.Figure(go.Bar(
+                x=(edges[:-1] + edges[1:]) / 2,
+                y=metrics[metric_key]['counts'],
+                width=np.diff(edges),
+                marker_color='#FC3D21'
+            ))
+            fig.update_layout(xaxis_title=metric_key.replace('_', ' ').title(), yaxis_title="Virtual Clones", bargap=0)
+            render_chart(fig, "Ensemble Distribution")
+
+def bathymetry_source():
+    """Configured bathymetry file and its modification time, or None for the synthetic basin"""
+    path = secret_setting("BATHYMETRY_PATH", "")
+    return (path, os.path.getmtime(path)) if path else None
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def run_cached_tsunami(cavity_diameter, source):
+    """Cache tsunami runs per (rounded) impact cavity and bathymetry file version"""
+    bathymetry = synthetic_bathymetry() if source is None else load_bathymetry(source[0])
+    return simulate_impact_tsunami(cavity_diameter, bathymetry, workers=min(4, os.cpu_count() or 1))
 
-def calculate_impact_effects(diameter, velocity, angle, material):
-    """Calculate dynamic impact effects"""
-    mass = (4/3) * np.pi * ((diameter/2)**3) * 3000
-    energy_joules = 0.5 * mass * (velocity * 1000)**2
-    energy_megatons = energy_joules / (4.184e15)
+def create_tsunami_analysis(impact_results):
+    """Tsunami arrival times and wave heights for an ocean impact"""
+    st.markdown("### 🌊 TSUNAMI PROPAGATION")
     
-    crater_diameter = 1.2 * diameter * (velocity / 10) * np.sin(np.radians(angle))
-    seismic_magnitude = 4.5 + (np.log10(energy_joules) - 12) / 1.5
-    fireball_radius = 50 * (energy_megatons ** 0.4)
+    if impact_results['airburst']:
+        st.info("💨 The asteroid bursts in the atmosphere - no impact cavity, no tsunami")
+        return
     
-    angle_factor = angle / 90
-    velocity_factor = velocity / 30
+    cavity = round(impact_results['transient_crater_diameter'], -1)
+    with st.spinner("Propagating tsunami across the ocean basin..."):
+        try:
+            tsunami = run_cached_tsunami(cavity, bathymetry_source())
+        except (OSError, ValueError, KeyError) as e:
+            st.warning(f"⚠️ Could not load the configured bathymetry ({e}); showing the synthetic ocean basin instead")
+            tsunami = run_cached_tsunami(cavity, None)
     
-    distribution = {
-        'Crater Formation': 35 + (15 * angle_factor),
-        'Seismic Waves': 20 + (10 * velocity_factor),
-        'Thermal Radiation': 25 + (5 * velocity_factor),
-        'Ejecta & Debris': 20 + (10 * (1 - angle_factor))
-    }
+    runup = tsunami['coastal_runup']
+    coastal_arrival = np.where(np.isnan(runup), np.nan, tsunami['arrival_time'])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Initial Wave Amplitude", f"{tsunami['initial_amplitude']:,.0f} m")
+    with col2:
+        st.metric("Max Coastal Run-up", f"{np.nanmax(runup):,.1f} m" if np.isfinite(runup).any() else "—")
+    with col3:
+        first_arrival = np.nanmin(coastal_arrival) if np.isfinite(coastal_arrival).any() else None
+        st.metric("First Coastal Arrival", f"{first_arrival / 60:,.0f} min" if first_arrival is not None else "—")
     
-    total = sum(distribution.values())
-    for key in distribution:
-        distribution[key] = (distribution[key] / total) * 100
+    # Thin the grids so each map ships at most ~100x100 cells
+    stride = max(1, int(np.ceil(max(runup.shape) / 100)))
+    km = tsunami['dx'] / 1000
+    x = np.arange(0, runup.shape[1], stride) * km
+    y = np.arange(0, runup.shape[0], stride) * km
     
-    return {
-        'energy_megatons': energy_megatons,
-        'crater_diameter': crater_diameter,
-        'seismic_magnitude': seismic_magnitude,
-        'fireball_radius': fireball_radius,
-        'affected_area': crater_diameter * 3,
-        'impact_distribution': distribution
-    }
+    map_col1, map_col2 = st.columns(2)
+    with map_col1:
+        st.markdown('<div class="chart-title">⏱️ Wave Arrival Time</div>', unsafe_allow_html=True)
+        fig_arrival = go.Figure(go.Heatmap(
+            x=x, y=y, z=tsunami['arrival_time'][::stride, ::stride] / 60,
+            colorscale='Viridis', colorbar=dict(title="min")
+        ))
+        fig_arrival.update_layout(xaxis_title="X (km)", yaxis_title="Y (km)", yaxis_scaleanchor="x")
+        render_chart(fig_arrival, "Tsunami Arrival Time")
+    with map_col2:
+        st.markdown('<div class="chart-title">🌊 Maximum Wave Amplitude</div>', unsafe_allow_html=True)
+        fig_amplitude = go.Figure(go.Heatmap(
+            x=x, y=y, z=np.log10(np.maximum(tsunami['max_amplitude'][::stride, ::stride], 1e-3)),
+            colorscale='Blues', colorbar=dict(title="log₁₀ m")
+        ))
+        fig_amplitude.update_layout(xaxis_title="X (km)", yaxis_title="Y (km)", yaxis_scaleanchor="x")
+        render_chart(fig_amplitude, "Tsunami Maximum Amplitude")
+    
+    st.caption(f"Linear shallow-water solver: {tsunami['steps']:,} steps of {tsunami['dt']:.1f} s "
+               f"on {tsunami['workers']} worker(s) in {tsunami['elapsed']:.1f} s")
 
 def create_impactor_2025_scenario():
     """Impactor-2025 Interactive Scenario"""
@@ -409,52 +532,37 @@ def generate_3d_orbital_map(neo_data):
         name="Earth"
     ))
     
-    # Extract asteroid data and plot orbits
-    asteroid_count = 0
-    for date, objects in neo_data['near_earth_objects'].items():
-        for obj in objects[:5]:
-            try:
-                distance = float(obj['close_approach_data'][0]['miss_distance']['kilometers'])
-                velocity = float(obj['close_approach_data'][0]['relative_velocity']['kilometers_per_second'])
-                hazardous = obj['is_potentially_hazardous_asteroid']
-                diameter = obj['estimated_diameter']['meters']['estimated_diameter_min']
-                
-                # Create elliptical orbit
-                theta = np.linspace(0, 2*np.pi, 100)
-                r = distance / 1000
-                x_orbit = r * np.cos(theta) + random.uniform(-2, 2)
-                y_orbit = r * np.sin(theta) + random.uniform(-2, 2)
-                z_orbit = np.sin(theta) * r * 0.3
-                
-                # Add orbit path
-                fig.add_trace(go.Scatter3d(
-                    x=x_orbit, y=y_orbit, z=z_orbit,
-                    mode='lines',
-                    line=dict(width=2, color='red' if hazardous else 'green'),
-                    name=f"{obj['name']} - {'Hazardous' if hazardous else 'Safe'}",
-                    showlegend=False
-                ))
-                
-                # Add asteroid point
-                fig.add_trace(go.Scatter3d(
-                    x=[x_orbit[0]], y=[y_orbit[0]], z=[z_orbit[0]],
-                    mode='markers',
-                    marker=dict(
-                        size=max(5, diameter / 50),
-                        color='red' if hazardous else 'green',
-                        opacity=0.8
-                    ),
-                    name=obj['name'],
-                    text=f"{obj['name']}<br>Diameter: {diameter:.0f}m<br>Velocity: {velocity:.1f} km/s<br>Hazardous: {hazardous}",
-                    hoverinfo='text'
-                ))
-                
-                asteroid_count += 1
-                if asteroid_count >= 15:
-                    break
-                    
-            except (KeyError, ValueError):
-                continue
+    # Plot each object's orbit with the asteroid at its close-approach position
+    orbits = feed_orbits(neo_data)
+    x_orbits, y_orbits, z_orbits = orbit_track_positions(orbits, np.linspace(0, 2*np.pi, 100))
+    for k, name in enumerate(orbits['name']):
+        hazardous = orbits['hazardous'][k]
+        diameter = orbits['diameter'][k]
+        velocity = orbits['velocity'][k]
+        x_orbit, y_orbit, z_orbit = x_orbits[k], y_orbits[k], z_orbits[k]
+        
+        # Add orbit path
+        fig.add_trace(go.Scatter3d(
+            x=x_orbit, y=y_orbit, z=z_orbit,
+            mode='lines',
+            line=dict(width=2, color='red' if hazardous else 'green'),
+            name=f"{name} - {'Hazardous' if hazardous else 'Safe'}",
+            showlegend=False
+        ))
+        
+        # Add asteroid point
+        fig.add_trace(go.Scatter3d(
+            x=[x_orbit[0]], y=[y_orbit[0]], z=[z_orbit[0]],
+            mode='markers',
+            marker=dict(
+                size=max(5, diameter / 50),
+                color='red' if hazardous else 'green',
+                opacity=0.8
+            ),
+            name=name,
+            text=f"{name}<br>Diameter: {diameter:.0f}m<br>Velocity: {velocity:.1f} km/s<br>Hazardous: {hazardous}",
+            hoverinfo='text'
+        ))
     
     fig.update_layout(
         title="3D Asteroid Orbital Visualization",
@@ -472,6 +580,192 @@ def generate_3d_orbital_map(neo_data):
     
     return fig
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_cached_orbit_animation(_neo_data, version, byte_budget):
+    """Animated orbit frames, built once per feed version and byte budget"""
+    return build_orbit_animation(_neo_data, byte_budget=byte_budget)
+
+@st.cache_resource(show_spinner="Loading JPL small-body catalog...")
+def load_cached_sbdb_catalog(path):
+    """Memory-mapped SBDB catalog, built from a raw export on first use"""
+    return load_catalog(path)
+
+def load_sbdb_catalog():
+    """SBDB catalog from the path in secrets; None if unset, with a warning if it fails to load"""
+    path = secret_setting("SBDB_CATALOG_PATH", "")
+    if not path:
+        return None
+    try:
+        return load_cached_sbdb_catalog(path)
+    except (OSError, ValueError, KeyError) as e:
+        st.warning(f"⚠️ Could not load the SBDB catalog at {path} ({e}); catalog views are unavailable")
+        return None
+
+def generate_catalog_orbit_map(catalog, max_objects=30, samples=120):
+    """Heliocentric 3D orbits of the largest potentially hazardous catalog objects"""
+    hazardous = np.flatnonzero(catalog['pha'])
+    pool = hazardous if hazardous.size else np.arange(len(catalog))
+    largest = pool[np.argsort(np.asarray(catalog['diameter'][pool]))[::-1][:max_objects]]
+    objects = catalog[np.sort(largest)]
+    
+    # Whole orbits for every object in one vectorized pass
+    x, y, z = orbit_positions(objects, np.linspace(0, 360, samples))
+    now_x, now_y, now_z = orbit_positions(objects, np.asarray(objects['ma'], dtype=float)[:, None])
+    
+    fig = go.Figure()
+    theta = np.linspace(0, 2 * np.pi, samples)
+    fig.add_trace(go.Scatter3d(
+        x=np.cos(theta), y=np.sin(theta), z=np.zeros(samples),
+        mode='lines', line=dict(width=4, color='#1f77b4'), name="Earth orbit"
+    ))
+    fig.add_trace(go.Scatter3d(
+        x=[0], y=[0], z=[0], mode='markers', marker=dict(size=8, color='#FFD700'), name="Sun"
+    ))
+    for k, obj in enumerate(objects):
+        name = obj['name'].decode()
+        fig.add_trace(go.Scatter3d(
+            x=x[k], y=y[k], z=z[k],
+            mode='lines',
+            line=dict(width=2, color='red' if obj['pha'] else 'green'),
+            name=name,
+            showlegend=False
+        ))
+    fig.add_trace(go.Scatter3d(
+        x=now_x[:, 0], y=now_y[:, 0], z=now_z[:, 0],
+        mode='markers',
+        marker=dict(size=np.clip(np.asarray(objects['diameter']) / 500, 3, 12), color='red'),
+        text=[f"{o['name'].decode()}<br>Diameter: {o['diameter']:.0f}m<br>a: {o['a']:.2f} AU" for o in objects],
+        hoverinfo='text',
+        name="Position at epoch"
+    ))
+    fig.update_layout(
+        title="",
+        scene=dict(
+            xaxis_title="X (AU)",
+            yaxis_title="Y (AU)",
+            zaxis_title="Z (AU)",
+            bgcolor='black',
+            aspectmode='data'
+        ),
+        height=600,
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def calculate_catalog_statistics(_catalog, catalog_size):
+    """Summary stats, size bins and batch impact energies for the whole catalog"""
+    summary = catalog_summary(_catalog)
+    effects = catalog_impact_effects(_catalog)
+    energy = np.log10(np.asarray(effects['energy_megatons'])[np.isfinite(effects['energy_megatons'])])
+    diameter = np.asarray(_catalog['diameter'], dtype=float)
+    log_diameter = np.log10(diameter[np.isfinite(diameter) & (diameter > 0)])
+    return {
+        'summary': summary,
+        'size_bins': np.histogram(log_diameter, bins=40),
+        'energy_bins': np.histogram(energy, bins=40)
+    }
+
+def show_catalog_statistics(catalog):
+    """Catalog-wide statistics and batch impact energies from the SBDB catalog"""
+    st.markdown("### 🪐 JPL SMALL-BODY CATALOG")
+    stats = calculate_catalog_statistics(catalog, len(catalog))
+    summary = stats['summary']
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Near-Earth Objects", f"{summary['objects']:,}")
+    with col2:
+        st.metric("Potentially Hazardous", f"{summary['pha']:,}")
+    with col3:
+        st.metric("Larger than 140 m", f"{summary['larger_than_140m']:,}")
+    with col4:
+        st.metric("Larger than 1 km", f"{summary['larger_than_1km']:,}")
+    
+    cat_col1, cat_col2 = st.columns(2)
+    for column, (counts, edges), icon, title, axis in (
+        (cat_col1, stats['size_bins'], "📏", "Catalog Size Distribution", "Diameter (meters)"),
+        (cat_col2, stats['energy_bins'], "💥", "Batch Impact Energies", "Impact Energy (megatons TNT)")
+    ):
+        with column:
+            st.markdown(f'<div class="chart-title">{icon} {title}</div>', unsafe_allow_html=True)
+            centers = 10 ** ((edges[:-1] + edges[1:]) / 2)
+            fig = go.Figure(go.Bar(x=centers, y=counts, marker_color='#FC3D21', opacity=0.8))
+            fig.update_layout(xaxis_type='log', xaxis_title=axis, yaxis_title="Number of Asteroids", bargap=0.05)
+            render_chart(fig, title)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_feed_search_index(_neo_data, version):
+    """Search index over one published version of the NEO feed, shared across sessions"""
+    return build_trigrams(index_neo_feed(_neo_data))
+
+@st.cache_resource(show_spinner="Indexing JPL small-body catalog...", max_entries=2)
+def load_catalog_search_index(_catalog, catalog_size):
+    """Search index over the SBDB catalog, shared across sessions"""
+    return build_trigrams(index_catalog(_catalog))
+
+def show_asteroid_search(neo_data, version, catalog):
+    """Name search plus hazard, size, distance, speed and date filters over the indexed objects"""
+    st.markdown("### 🔎 ASTEROID SEARCH")
+    
+    sources = ["NASA NEO Feed"]
+    if catalog is not None and len(catalog):
+        sources.append("JPL Small-Body Catalog")
+    source = st.radio("Search in", sources, horizontal=True, key="search_source")
+    if source == "NASA NEO Feed":
+        index = load_feed_search_index(neo_data, version)
+    else:
+        index = load_catalog_search_index(catalog, len(catalog))
+    
+    search_col1, search_col2, search_col3 = st.columns([2, 1, 1])
+    with search_col1:
+        name = st.text_input("Name or designation", placeholder="e.g. Apophis, 2024 AB3", key="search_name")
+    with search_col2:
+        hazard_choice = st.selectbox("Hazard flag", ["Any", "Potentially hazardous", "Not hazardous"], key="search_hazard")
+    with search_col3:
+        min_diameter = st.number_input("Minimum diameter (m)", min_value=0, value=0, step=50, key="search_diameter")
+    
+    ranges = {'diameter': (min_diameter, None) if min_diameter else None}
+    if 'miss_distance' in index['sorted']:
+        filter_col1, filter_col2 = st.columns(2)
+        with filter_col1:
+            max_distance = st.number_input("Maximum miss distance (million km)", min_value=0.0, value=0.0,
+                                           step=1.0, help="0 for no limit", key="search_distance")
+        with filter_col2:
+            dates = index['sorted']['approach_date'].astype('datetime64[D]')
+            first, last = (dates[0], dates[-1]) if len(dates) else (np.datetime64('today'),) * 2
+            date_range = st.date_input("Close approach between", value=(first.item(), last.item()),
+                                       key="search_dates")
+        ranges['miss_distance'] = (None, max_distance * 1e6) if max_distance else None
+        if isinstance(date_range, (tuple, list)) and len(date_range) == 2:
+            ranges['approach_date'] = tuple(date_range)
+    
+    hazardous = {"Any": None, "Potentially hazardous": True, "Not hazardous": False}[hazard_choice]
+    start_time = time.perf_counter()
+    rows = query_index(index, name=name.strip() or None, hazardous=hazardous, **ranges)
+    elapsed = time.perf_counter() - start_time
+    
+    st.caption(f"{len(rows):,} of {index['size']:,} objects match · query took {elapsed * 1000:.1f} ms")
+    shown = rows[:200]
+    labels = index['labels'][shown]
+    results = pd.DataFrame({
+        'Name': [label.decode() if isinstance(label, bytes) else str(label) for label in labels],
+        'Diameter (m)': index['values']['diameter'][shown],
+        'Velocity (km/s)': index['values']['velocity'][shown],
+        'Hazardous': index['hazardous'][True][shown]
+    })
+    if 'miss_distance' in index['values']:
+        results['Miss Distance (km)'] = index['values']['miss_distance'][shown]
+        results['Close Approach'] = index['values']['approach_date'][shown].astype('datetime64[D]')
+    st.dataframe(
+        results.style.format({'Diameter (m)': '{:,.0f}', 'Velocity (km/s)': '{:.1f}', 'Miss Distance (km)': '{:,.0f}'}),
+        use_container_width=True,
+        hide_index=True,
+        height=300
+    )
+    if len(rows) > len(shown):
+        st.caption(f"Showing the first {len(shown)} matches")
+
 def generate_live_visualizations():
     """Generate dynamic visualizations for dashboard"""
     
@@ -563,32 +857,26 @@ def generate_nasa_data_visualizations(neo_data):
     if len(asteroids) > 0:
         df = pd.DataFrame(asteroids)
         
-        # 1. Asteroid Size Distribution
-        fig1 = px.histogram(
-            df, x='diameter',
-            nbins=15,
-            title="",
-            color_discrete_sequence=['#FC3D21'],
-            opacity=0.8
-        )
+        # 1. Asteroid Size Distribution (binned server-side)
+        fig1 = go.Figure(binned_histogram_trace(df['diameter'], nbins=15))
         fig1.update_layout(
+            title="",
             xaxis_title="Diameter (meters)",
             yaxis_title="Number of Asteroids",
             bargap=0.05
         )
         
-        # 2. Orbital Distance Analysis
-        fig2 = px.scatter(
-            df, x='distance', y='velocity', 
-            size='diameter',
-            color='hazardous', 
+        # 2. Orbital Distance Analysis (WebGL, density-aggregated above the point limit)
+        fig2 = go.Figure(scatter_gl_traces(
+            df['distance'], df['velocity'], df['diameter'], df['hazardous'],
+            color_map={True: '#d63031', False: '#00b894'},
+            labels={'x': 'Distance (km)', 'y': 'Velocity (km/s)', 'size': 'Diameter (m)'}
+        ))
+        fig2.update_layout(
             title="",
-            labels={
-                'distance': 'Distance (km)', 
-                'velocity': 'Velocity (km/s)', 
-                'hazardous': 'Hazardous'
-            },
-            color_discrete_map={True: '#d63031', False: '#00b894'}
+            xaxis_title="Distance (km)",
+            yaxis_title="Velocity (km/s)",
+            legend_title_text="Hazardous"
         )
         
         # 3. Hazardous Objects Analysis
@@ -625,11 +913,88 @@ def generate_nasa_data_visualizations(neo_data):
         # Fallback to simulated data if no real data
         return generate_live_visualizations()
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def calculate_feed_entry_outcomes(diameters, velocities):
+    """Batch atmospheric entry for every NEO feed object as if it struck Earth at 45°"""
+    # Arriving bodies also gain Earth's escape velocity
+    impact_velocity = np.sqrt(np.asarray(velocities) ** 2 + 11.19 ** 2)
+    return simulate_atmospheric_entry(np.asarray(diameters), impact_velocity, 45)
+
+def show_feed_entry_outcomes(neo_data):
+    """Airburst vs ground impact summary across the loaded NEO feed"""
+    diameters, velocities = [], []
+    for date, objects in neo_data['near_earth_objects'].items():
+        for obj in objects:
+            try:
+                diameters.append(float(obj['estimated_diameter']['meters']['estimated_diameter_min']))
+                velocities.append(float(obj['close_approach_data'][0]['relative_velocity']['kilometers_per_second']))
+            except (KeyError, ValueError, IndexError):
+                continue
+    
+    if not diameters:
+        return
+    
+    st.markdown("### ☄️ ATMOSPHERIC ENTRY OUTCOMES")
+    st.caption("Every object in the NEO feed propagated through the atmosphere as if it struck Earth at 45°")
+    outcomes = calculate_feed_entry_outcomes(tuple(diameters), tuple(velocities))
+    airbursts = outcomes['airburst']
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Airbursts", f"{int(airbursts.sum())}")
+    with col2:
+        st.metric("Ground Impacts", f"{int((~airbursts).sum())}")
+    with col3:
+        burst_text = f"{np.median(outcomes['burst_altitude'][airbursts]) / 1000:.1f} km" if airbursts.any() else "—"
+        st.metric("Median Burst Altitude", burst_text)
+
+def report_results():
+    """The session's latest impact and defense simulation results for the report"""
+    return {
+        'impact': st.session_state.get('report_impact'),
+        'defense': st.session_state.get('report_defense')
+    }
+
+@st.fragment(run_every=1.0)
+def poll_report():
+    """Check the background report once a second without rerunning the page"""
+    _, future = st.session_state.report
+    if future.done():
+        st.rerun()
+    st.info("📊 Rendering report in the background... keep exploring, the download appears here when it is ready.")
+
+def show_report_status():
+    """Download buttons for the session's report, or a poller while it renders"""
+    if st.session_state.get('report') is None:
+        return
+    _, future = st.session_state.report
+    if not future.done():
+        poll_report()
+        return
+    if future.exception() is not None:
+        st.error(f"Report generation failed: {future.exception()}")
+        return
+    report = future.result()
+    stamp = report['generated'].strftime('%Y%m%d_%H%M%S')
+    st.success(f"📊 Report ready, generated {report['generated'].strftime('%Y-%m-%d %H:%M:%S')}")
+    html_col, pdf_col = st.columns(2)
+    with html_col:
+        st.download_button("⬇️ Download HTML Report", report['html'], file_name=f"meteor_madness_report_{stamp}.html",
+                           mime="text/html", use_container_width=True)
+    with pdf_col:
+        st.download_button("⬇️ Download PDF Report", report['pdf'], file_name=f"meteor_madness_report_{stamp}.pdf",
+                           mime="application/pdf", use_container_width=True)
+
 def main():
     if 'defense_deployed' not in st.session_state:
         st.session_state.defense_deployed = False
     if 'run_impact' not in st.session_state:
         st.session_state.run_impact = False
+    if 'run_ensemble' not in st.session_state:
+        st.session_state.run_ensemble = False
+    if 'payload_history' not in st.session_state:
+        st.session_state.payload_history = []
+    st.session_state.payload_bytes = {}
     
     navigation()
     
@@ -643,7 +1008,10 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    neo_data = fetch_live_neo_data()
+    # Read the published snapshots once per rerun; fetching happens in the background
+    start_data_refresh()
+    neo_snapshot = latest('neo')
+    neo_data = neo_snapshot['data']
     
     # تبويبات بس من غير تبويب الريبورت
     tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
@@ -662,31 +1030,15 @@ def main():
         
         with col1:
             if st.button("🔄 REFRESH DATA", use_container_width=True):
-                st.rerun()
+                if request_refresh():
+                    st.toast("Refresh requested; new data appears once it lands")
+                else:
+                    st.toast("Data was refreshed under a minute ago; try again shortly")
         
         with col2:
-            # زر GENERATE REPORT باللون الأحمر
-            REPORT_URL = "https://drive.google.com/file/d/1tCIIT6jPK7OgKgM4opSibf7HXOviWZkr/view"
-            
-            st.markdown(f"""
-            <a href="{REPORT_URL}" target="_blank" style="text-decoration: none;">
-                <button style="
-                    background: linear-gradient(135deg, #FC3D21 0%, #e62e1a 100%);
-                    color: white;
-                    border: none;
-                    padding: 12px 24px;
-                    border-radius: 8px;
-                    font-weight: bold;
-                    font-size: 1rem;
-                    cursor: pointer;
-                    transition: all 0.3s ease;
-                    width: 100%;
-                " onmouseover="this.style.transform='translateY(-2px)'; this.style.boxShadow='0 6px 20px rgba(252, 61, 33, 0.4)';" 
-                onmouseout="this.style.transform='translateY(0)'; this.style.boxShadow='none';">
-                📊 GENERATE REPORT
-                </button>
-            </a>
-            """, unsafe_allow_html=True)
+            # زر GENERATE REPORT
+            if st.button("📊 GENERATE REPORT", use_container_width=True):
+                st.session_state.report = request_report(neo_snapshot, latest('usgs'), report_results())
         
         with col3:
             if st.button("🚨 ALERT STATUS", use_container_width=True):
@@ -696,6 +1048,8 @@ def main():
             if st.button("🌍 GLOBAL VIEW", use_container_width=True):
                 st.info("🛰️ Loading global asteroid distribution...")
         
+        show_report_status()
+        
         st.markdown("### 📊 QUICK STATS")
         stats_col1, stats_col2, stats_col3, stats_col4 = st.columns(4)
         
@@ -720,21 +1074,21 @@ def main():
         
         with viz_col1:
             st.markdown('<div class="chart-title">🚀 Asteroid Velocity Distribution</div>', unsafe_allow_html=True)
-            st.plotly_chart(figs[0], use_container_width=True)
+            render_chart(figs[0], "Velocity Distribution")
         
         with viz_col2:
             st.markdown('<div class="chart-title">⚠️ Threat Level Distribution</div>', unsafe_allow_html=True)
-            st.plotly_chart(figs[1], use_container_width=True)
+            render_chart(figs[1], "Threat Levels")
         
         viz_col3, viz_col4 = st.columns(2)
         
         with viz_col3:
             st.markdown('<div class="chart-title">📅 Close Approaches Timeline 2025</div>', unsafe_allow_html=True)
-            st.plotly_chart(figs[2], use_container_width=True)
+            render_chart(figs[2], "Close Approaches Timeline")
         
         with viz_col4:
             st.markdown('<div class="chart-title">📊 Size vs Hazard Correlation</div>', unsafe_allow_html=True)
-            st.plotly_chart(figs[3], use_container_width=True)
+            render_chart(figs[3], "Size vs Hazard")
     
     with tab2:
         st.markdown("## 💥 ASTEROID IMPACT SIMULATOR")
@@ -749,6 +1103,8 @@ def main():
             angle = st.slider("Impact Angle (degrees)", 15, 90, 45)
             material = st.selectbox("Target Material", 
                                   ["Ocean", "Continental Crust", "Sedimentary Rock", "Granite"])
+            composition = st.selectbox("Asteroid Composition", list(PROJECTILE_DENSITIES), index=2)
+            density = PROJECTILE_DENSITIES[composition]
             
             if st.button("🚀 SIMULATE IMPACT", use_container_width=True):
                 st.session_state.run_impact = True
@@ -757,33 +1113,63 @@ def main():
             st.markdown("### 📊 IMPACT ANALYSIS")
             
             if st.session_state.get('run_impact', False):
-                impact_results = calculate_impact_effects(diameter, velocity, angle, material)
+                impact_results = cached_impact_with_entry(diameter, velocity, angle, material, density)
+                st.session_state.report_impact = {
+                    'diameter': diameter, 'velocity': velocity, 'angle': angle,
+                    'material': material, 'composition': composition,
+                    **{key: impact_results[key] for key in (
+                        'energy_megatons', 'airburst', 'burst_altitude', 'residual_velocity', 'crater_diameter',
+                        'seismic_magnitude', 'fireball_radius', 'affected_area', 'impact_distribution')}
+                }
+                
+                if impact_results['airburst']:
+                    entry_outcome = f"Airburst at {impact_results['burst_altitude'] / 1000:.1f} km altitude"
+                else:
+                    entry_outcome = f"Ground impact at {impact_results['residual_velocity']:.1f} km/s"
+                breakup = impact_results['breakup_altitude']
+                breakup_text = "Intact" if np.isnan(breakup) else f"{breakup / 1000:.1f} km altitude"
+                seismic = impact_results['seismic_magnitude']
+                seismic_text = "—" if np.isnan(seismic) else f"{seismic:.1f} Richter"
                 
                 st.markdown(f"""
                 <div class="data-card">
                     <h3 style="color: #FC3D21;">💥 IMPACT SIMULATION RESULTS</h3>
                     <p><strong>Energy Release:</strong> {impact_results['energy_megatons']:,.1f} megatons TNT</p>
+                    <p><strong>Atmospheric Entry:</strong> {entry_outcome}</p>
+                    <p><strong>Breakup:</strong> {breakup_text}</p>
+                    <p><strong>Energy Deposited in Atmosphere:</strong> {impact_results['energy_deposited_megatons']:,.1f} megatons TNT</p>
                     <p><strong>Crater Diameter:</strong> {impact_results['crater_diameter']:,.0f} meters</p>
-                    <p><strong>Seismic Magnitude:</strong> {impact_results['seismic_magnitude']:.1f} Richter</p>
+                    <p><strong>Transient Cavity:</strong> {impact_results['transient_crater_diameter']:,.0f} meters</p>
+                    <p><strong>Seismic Magnitude:</strong> {seismic_text}</p>
                     <p><strong>Fireball Radius:</strong> {impact_results['fireball_radius']:.1f} km</p>
                     <p><strong>Affected Area:</strong> {impact_results['affected_area']:,.0f} km²</p>
                 </div>
                 """, unsafe_allow_html=True)
                 
-                impact_dist_df = pd.DataFrame({
-                    'Effect': list(impact_results['impact_distribution'].keys()),
-                    'Percentage': list(impact_results['impact_distribution'].values())
-                })
+                profile = impact_results['deposition_profile']
+                st.markdown('<div class="chart-title">☄️ Atmospheric Energy Deposition</div>', unsafe_allow_html=True)
+                fig_entry = go.Figure(go.Scatter(
+                    x=profile['megatons_per_km'],
+                    y=profile['altitude'] / 1000,
+                    mode='lines',
+                    line=dict(color='#FC3D21', width=3),
+                    fill='tozerox'
+                ))
+                fig_entry.update_layout(
+                    xaxis_title="Energy Deposition (megatons/km)",
+                    yaxis_title="Altitude (km)",
+                    yaxis_range=[0, 100]
+                )
+                render_chart(fig_entry, "Atmospheric Energy Deposition")
                 
                 st.markdown('<div class="chart-title">💥 Impact Energy Distribution</div>', unsafe_allow_html=True)
-                fig = px.pie(
-                    impact_dist_df, 
-                    values='Percentage', 
-                    names='Effect',
-                    hole=0.4,
-                    color_discrete_sequence=px.colors.sequential.RdBu
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                fig = cached_impact_distribution_figure(diameter, velocity, angle, material, density)
+                render_chart(fig, "Impact Energy Distribution")
+                
+                if material == "Ocean":
+                    create_tsunami_analysis(impact_results)
+        
+        create_uncertainty_ensemble(neo_data['data'], material)
     
     with tab3:
         st.markdown("## 🛡️ PLANETARY DEFENSE SYSTEMS")
@@ -841,10 +1227,15 @@ def main():
         
         with defense_col2:
             if st.session_state.get('defense_deployed', False):
-                success_rate, miss_distance = calculate_defense_success(
+                success_rate, miss_distance = cached_defense_success(
                     defense_strategy, asteroid_size, warning_time
                 )
                 
+                st.session_state.report_defense = {
+                    'strategy': defense_strategy, 'asteroid_size': asteroid_size, 'warning_time': warning_time,
+                    'success_rate': success_rate, 'miss_distance': miss_distance
+                }
+                
                 earth_safety = "GUARANTEED" if success_rate > 0.8 else "PROBABLE" if success_rate > 0.6 else "UNCERTAIN"
                 
                 st.markdown(f"""
@@ -872,9 +1263,26 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        with st.spinner("Generating 3D orbital visualization..."):
-            fig_3d = generate_3d_orbital_map(neo_data['data'])
-            st.plotly_chart(fig_3d, use_container_width=True)
+        animate = st.toggle("▶️ Animate close approaches", key="animate_orbits",
+                            help="Play the tracked objects along their paths across the feed window")
+        if animate:
+            with st.spinner("Precomputing animation frames..."):
+                spec, frames = build_cached_orbit_animation(neo_data['data'], neo_snapshot['version'],
+                                                            ANIMATION_BYTE_BUDGET)
+            render_chart(spec, "3D Orbital Animation")
+            st.caption(f"{frames['objects']} objects · {frames['frames']} of {frames['candidate_frames']} hourly frames "
+                       f"(every {frames['frame_step_hours']:.1f} h) · {frames['bytes'] / 1024:,.0f} KB "
+                       f"of a {frames['byte_budget'] / 1024:,.0f} KB budget"
+                       + (" · ⚠️ over budget: the static traces alone exceed it" if frames['over_budget'] else ""))
+        else:
+            with st.spinner("Generating 3D orbital visualization..."):
+                fig_3d = generate_3d_orbital_map(neo_data['data'])
+                render_chart(fig_3d, "3D Orbital Map")
+        
+        catalog = load_sbdb_catalog()
+        if catalog is not None and len(catalog):
+            st.markdown("### 🪐 LARGEST HAZARDOUS ASTEROIDS (JPL SBDB)")
+            render_chart(generate_catalog_orbit_map(catalog), "Catalog Orbit Map")
         
         st.markdown("""
         <div class="data-card">
@@ -898,11 +1306,14 @@ def main():
         <div class="status-success">
             <h3>🛰️ NASA DATA INTEGRATION</h3>
             <p><strong>Status:</strong> {status_icon} {status_text}</p>
-            <p><strong>Last Update:</strong> {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+            <p><strong>Last Update:</strong> {datetime.fromtimestamp(neo_snapshot['published_at']).strftime("%Y-%m-%d %H:%M:%S")}</p>
             <p><strong>Objects Tracked:</strong> {neo_data['count']} near-Earth objects</p>
         </div>
         """, unsafe_allow_html=True)
         
+        catalog = load_sbdb_catalog()
+        show_asteroid_search(neo_data['data'], neo_snapshot['version'], catalog)
+        
         st.markdown("### 📈 COMPREHENSIVE DATA ANALYSIS")
         
         nasa_figs = generate_nasa_data_visualizations(neo_data['data'])
@@ -911,24 +1322,29 @@ def main():
         
         with nasa_col1:
             st.markdown('<div class="chart-title">📏 Asteroid Size Distribution</div>', unsafe_allow_html=True)
-            st.plotly_chart(nasa_figs[0], use_container_width=True)
+            render_chart(nasa_figs[0], "Asteroid Size Distribution")
         
         with nasa_col2:
             st.markdown('<div class="chart-title">🌍 Orbital Dynamics Analysis</div>', unsafe_allow_html=True)
-            st.plotly_chart(nasa_figs[1], use_container_width=True)
+            render_chart(nasa_figs[1], "Orbital Dynamics")
         
         nasa_col3, nasa_col4 = st.columns(2)
         
         with nasa_col3:
             st.markdown('<div class="chart-title">⚠️ Hazardous Objects Analysis</div>', unsafe_allow_html=True)
-            st.plotly_chart(nasa_figs[2], use_container_width=True)
+            render_chart(nasa_figs[2], "Hazardous Objects")
         
         with nasa_col4:
             st.markdown('<div class="chart-title">🔥 Impact Probability Heatmap</div>', unsafe_allow_html=True)
-            st.plotly_chart(nasa_figs[3], use_container_width=True)
+            render_chart(nasa_figs[3], "Impact Probability Heatmap")
+        
+        show_feed_entry_outcomes(neo_data['data'])
+        
+        if catalog is not None and len(catalog):
+            show_catalog_statistics(catalog)
         
         # Earthquake data with map
-        earthquakes = fetch_usgs_earthquake_data()
+        earthquakes = latest('usgs')['data']
         if earthquakes:
             st.markdown("### 🌋 RECENT SEISMIC ACTIVITY (USGS Data)")
             
@@ -961,7 +1377,7 @@ def main():
                 margin={"r":0,"t":30,"l":0,"b":0}
             )
             
-            st.plotly_chart(fig_map, use_container_width=True)
+            render_chart(fig_map, "Earthquake Map")
             
             # Quick stats
             col1, col2, col3 = st.columns(3)
@@ -982,6 +1398,10 @@ def main():
                 use_container_width=True,
                 height=300
             )
+    
+    show_payload_stats()
+    show_cache_stats()
+    show_refresh_stats()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,166 @@
+import numpy as np
+
+from crater_scaling import DEFAULT_PROJECTILE_DENSITY
+
+ENTRY_ALTITUDE = 100000.0  # m
+ALTITUDE_STEP = 250.0  # m, fixed integration step in altitude
+SCALE_HEIGHT = 8000.0  # m
+SEA_LEVEL_AIR_DENSITY = 1.225  # kg/m³
+GRAVITY = 9.81  # m/s²
+DRAG_COEFFICIENT = 2.0
+HEAT_TRANSFER_COEFFICIENT = 0.1
+ABLATION_HEAT = 8.0e6  # J/kg, heat of ablation of stone
+PANCAKE_FACTOR = 7.0  # max spread of the debris cloud relative to its radius at breakup
+# Scales the pancake spreading rate; 0.5 puts Tunguska- and Chelyabinsk-like
+# entries near their observed burst altitudes (~10 km and ~30 km)
+DISPERSION_COEFFICIENT = 0.5
+STOP_VELOCITY = 100.0  # m/s, bodies slower than this fall at terminal velocity
+MEGATON = 4.184e15  # J
+ENTRY_CHUNK_SIZE = 65536
+
+def yield_strength(density):
+    """Aerodynamic breakup strength (Pa) from bulk density (Collins et al. 2005)"""
+    return 10 ** (2.107 + 0.0624 * np.sqrt(density))
+
+def air_density(altitude):
+    """Exponential atmosphere"""
+    return SEA_LEVEL_AIR_DENSITY * np.exp(-altitude / SCALE_HEIGHT)
+
+def _entry_derivatives(altitude, velocity, mass, radius, spread_rate, fragmented, max_radius,
+                       sin_angle, density):
+    """Rates of change per metre of descent for velocity, mass, radius and spread rate"""
+    rho_a = air_density(altitude)
+    area = np.pi * radius * radius
+    ram = rho_a * velocity * velocity
+    # Time spent per metre of altitude lost; stopped bodies are masked out by the caller
+    dt_dh = 1 / (np.maximum(velocity, STOP_VELOCITY) * sin_angle)
+
+    dv = (GRAVITY * sin_angle - DRAG_COEFFICIENT * ram * area / (2 * mass)) * dt_dh
+    dm = -HEAT_TRANSFER_COEFFICIENT * ram * velocity * area / (2 * ABLATION_HEAT) * dt_dh
+    # Pancake model: after breakup the debris cloud spreads under the pressure difference
+    spreading = fragmented & (radius < max_radius)
+    dr = np.where(spreading, spread_rate, 0.0) * dt_dh
+    dspread = np.where(spreading, DISPERSION_COEFFICIENT * ram / (2 * density * radius), 0.0) * dt_dh
+    return dv, dm, dr, dspread
+
+def _simulate_chunk(diameter, velocity, angle, density, step, return_profile):
+    """Integrate one chunk of bodies from entry altitude to the ground"""
+    n = diameter.size
+    sin_angle = np.sin(np.radians(angle))
+    strength = yield_strength(density)
+
+    v = velocity * 1000.0
+    radius = diameter / 2
+    mass = (4 / 3) * np.pi * radius ** 3 * density
+    initial_mass = mass.copy()
+    spread_rate = np.zeros(n)
+    fragmented = np.zeros(n, dtype=bool)
+    max_radius = np.full(n, np.inf)
+    breakup_altitude = np.full(n, np.nan)
+    alive = np.ones(n, dtype=bool)
+
+    kinetic = 0.5 * mass * v * v
+    entry_energy = kinetic.copy()
+    potential = np.zeros(n)
+    deposited = np.zeros(n)
+    peak_deposition = np.zeros(n)
+    burst_altitude = np.full(n, np.nan)
+
+    altitudes = np.arange(ENTRY_ALTITUDE, 0, -step)
+    profile = np.zeros((altitudes.size, n)) if return_profile else None
+
+    for i, h in enumerate(altitudes):
+        if not alive.any():
+            break
+        dh = min(step, h)
+
+        # Breakup once ram pressure exceeds the body's strength
+        breaking = alive & ~fragmented & (air_density(h) * v * v > strength)
+        if breaking.any():
+            fragmented |= breaking
+            max_radius[breaking] = PANCAKE_FACTOR * radius[breaking]
+            breakup_altitude[breaking] = h
+
+        # Heun's method, descending by dh
+        args = (fragmented, max_radius, sin_angle, density)
+        k1 = _entry_derivatives(h, v, mass, radius, spread_rate, *args)
+        pred = [x + dh * k for x, k in zip((v, mass, radius, spread_rate), k1)]
+        pred[0] = np.maximum(pred[0], STOP_VELOCITY)
+        pred[1] = np.maximum(pred[1], 1e-9 * mass)
+        k2 = _entry_derivatives(h - dh, *pred, *args)
+
+        new_v = v + 0.5 * dh * (k1[0] + k2[0])
+        new_mass = mass + 0.5 * dh * (k1[1] + k2[1])
+        new_radius = np.minimum(radius + 0.5 * dh * (k1[2] + k2[2]), max_radius)
+        new_spread = spread_rate + 0.5 * dh * (k1[3] + k2[3])
+
+        # Bodies that have stopped or ablated away keep their last state
+        new_v = np.where(alive, np.maximum(new_v, 0.0), v)
+        new_mass = np.where(alive, np.clip(new_mass, 1e-9 * initial_mass, mass), mass)
+        # Energy released this step: kinetic energy lost plus the potential energy of the drop,
+        # which gravity would otherwise count as negative deposition for slow, heavy bodies
+        released = np.where(alive, 0.5 * (mass + new_mass) * GRAVITY * dh, 0.0)
+        v, mass = new_v, new_mass
+        radius = np.where(alive, new_radius, radius)
+        spread_rate = np.where(alive, new_spread, spread_rate)
+        alive &= (v > STOP_VELOCITY) & (mass > 1e-6 * initial_mass)
+
+        new_kinetic = 0.5 * mass * v * v
+        potential += released
+        # Clamp the integrator's round-off so the profile never shows negative deposition
+        deposition = np.maximum(kinetic - new_kinetic + released, 0.0) / dh  # J per metre of altitude
+        deposited += deposition * dh
+        kinetic = new_kinetic
+
+        higher = deposition > peak_deposition
+        peak_deposition = np.where(higher, deposition, peak_deposition)
+        burst_altitude = np.where(higher, h - dh / 2, burst_altitude)
+        if return_profile:
+            profile[i] = deposition
+
+    # An airburst deposits most of the energy released on the way down (entry kinetic plus potential);
+    # a body that reaches the ground has no burst altitude
+    airburst = deposited >= 0.5 * (entry_energy + potential)
+    result = {
+        'entry_energy_megatons': entry_energy / MEGATON,
+        'energy_deposited_megatons': deposited / MEGATON,
+        'residual_energy_megatons': kinetic / MEGATON,
+        'residual_velocity': v / 1000.0,
+        'residual_mass_fraction': mass / initial_mass,
+        'breakup_altitude': breakup_altitude,
+        'burst_altitude': np.where(airburst, burst_altitude, np.nan),
+        'airburst': airburst
+    }
+    if return_profile:
+        result['profile_altitude'] = altitudes - step / 2
+        result['profile_megatons_per_km'] = profile * 1000 / MEGATON
+    return result
+
+def simulate_atmospheric_entry(diameter, velocity, angle, density=DEFAULT_PROJECTILE_DENSITY,
+                               step=ALTITUDE_STEP, chunk_size=ENTRY_CHUNK_SIZE, return_profile=False):
+    """Fixed-step entry, ablation and pancake fragmentation for many bodies at once
+
+    diameter in meters, velocity in km/s, angle in degrees from horizontal and
+    density in kg/m³; scalars and arrays broadcast together. Returns arrays of
+    burst altitude (m, NaN for ground impacts), residual velocity (km/s) and
+    energy deposition (Mt).
+    """
+    diameter, velocity, angle, density = (
+        np.ravel(a).astype(float) for a in np.broadcast_arrays(diameter, velocity, angle, density)
+    )
+    chunks = [
+        _simulate_chunk(diameter[s:s + chunk_size], velocity[s:s + chunk_size], angle[s:s + chunk_size],
+                        density[s:s + chunk_size], step, return_profile)
+        for s in range(0, max(diameter.size, 1), chunk_size)  # an empty batch still yields one (empty) chunk
+    ]
+    if len(chunks) == 1:
+        return chunks[0]
+    result = {}
+    for key in chunks[0]:
+        if key == 'profile_altitude':
+            result[key] = chunks[0][key]
+        elif key == 'profile_megatons_per_km':
+            result[key] = np.concatenate([c[key] for c in chunks], axis=1)
+        else:
+            result[key] = np.concatenate([c[key] for c in chunks])
+    return result
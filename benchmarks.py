@@ -0,0 +1,269 @@
+"""Performance regression benchmarks: python benchmarks.py [name ...]
+
+Each benchmark prints its timings and returns False when a guarded limit is
+exceeded; the script exits non-zero if any benchmark fails.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from atmospheric_entry import simulate_atmospheric_entry
+from crater_scaling import crater_dimensions
+from impact_models import DEFENSE_BASE_SUCCESS, calculate_impact_effects
+from neo_search import build_search_index, build_trigrams, query_index
+from tsunami import simulate_impact_tsunami
+
+def _best_time(func, number, repeat=5):
+    """Best per-call wall time over several repeats"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+def _legacy_crater_diameter(diameter, velocity, angle):
+    """The linear crater formula the scaling engine replaced"""
+    return 1.2 * diameter * (velocity / 10) * np.sin(np.radians(angle))
+
+def _legacy_impact_effects(diameter, velocity, angle):
+    """The impact model as it was before material-aware crater scaling"""
+    mass = (4/3) * np.pi * ((diameter/2)**3) * 3000
+    energy_joules = 0.5 * mass * (velocity * 1000)**2
+    energy_megatons = energy_joules / (4.184e15)
+    crater_diameter = _legacy_crater_diameter(diameter, velocity, angle)
+    seismic_magnitude = 4.5 + (np.log10(energy_joules) - 12) / 1.5
+    fireball_radius = 50 * (energy_megatons ** 0.4)
+    angle_factor = angle / 90
+    velocity_factor = velocity / 30
+    distribution = {
+        'Crater Formation': 35 + (15 * angle_factor),
+        'Seismic Waves': 20 + (10 * velocity_factor),
+        'Thermal Radiation': 25 + (5 * velocity_factor),
+        'Ejecta & Debris': 20 + (10 * (1 - angle_factor))
+    }
+    total = sum(distribution.values())
+    for key in distribution:
+        distribution[key] = (distribution[key] / total) * 100
+    return energy_megatons, crater_diameter, seismic_magnitude, fireball_radius, distribution
+
+def bench_crater_scaling(batch_size=1_000_000):
+    """Crater scaling must stay as fast as the linear formula it replaced"""
+    rng = np.random.default_rng(0)
+    diameter = rng.uniform(50, 2000, batch_size)
+    velocity = rng.uniform(5, 30, batch_size)
+    angle = rng.uniform(15, 90, batch_size)
+
+    # (label, new, legacy, calls per repeat, max new/legacy ratio). Batched scaling adds three
+    # logs and three exps per body to the linear formula's sine, so it gets 1.8x.
+    cases = [
+        ("crater scalar", lambda: crater_dimensions(500, 15, 45, "Granite"),
+         lambda: _legacy_crater_diameter(500, 15, 45), 20000, 1.5),
+        ("crater batch", lambda: crater_dimensions(diameter, velocity, angle, "Granite"),
+         lambda: _legacy_crater_diameter(diameter, velocity, angle), 3, 1.8),
+        ("impact scalar", lambda: calculate_impact_effects(500, 15, 45, "Granite"),
+         lambda: _legacy_impact_effects(500, 15, 45), 20000, 1.5),
+        ("impact batch", lambda: calculate_impact_effects(diameter, velocity, angle, "Granite"),
+         lambda: _legacy_impact_effects(diameter, velocity, angle), 3, 1.6)
+    ]
+
+    passed = True
+    for label, new, legacy, number, limit in cases:
+        new_time = _best_time(new, number)
+        legacy_time = _best_time(legacy, number)
+        ratio = new_time / legacy_time
+        ok = ratio <= limit
+        passed &= ok
+        print(f"{label:<16} new {new_time * 1e6:>12,.2f} us  legacy {legacy_time * 1e6:>12,.2f} us  "
+              f"ratio {ratio:5.2f} (limit {limit:.1f}) {'ok' if ok else 'FAIL'}")
+    return passed
+
+def bench_atmospheric_entry(batch_size=100_000, slider_limit=0.1, per_body_limit=50e-6):
+    """Entry must stay interactive for one body and cheap per body for catalog batches"""
+    rng = np.random.default_rng(0)
+    diameter = rng.uniform(10, 1000, batch_size)
+    velocity = rng.uniform(11, 30, batch_size)
+    angle = rng.uniform(15, 90, batch_size)
+
+    single = _best_time(lambda: simulate_atmospheric_entry(50, 17, 45), 5)
+    batch = _best_time(lambda: simulate_atmospheric_entry(diameter, velocity, angle), 1, repeat=2)
+    per_body = batch / batch_size
+
+    single_ok = single <= slider_limit
+    batch_ok = per_body <= per_body_limit
+    print(f"single body      {single * 1e3:>10,.2f} ms  (limit {slider_limit * 1e3:.0f} ms) {'ok' if single_ok else 'FAIL'}")
+    print(f"{batch_size:,} bodies   {batch:>10,.2f} s   {per_body * 1e6:.1f} us/body "
+          f"(limit {per_body_limit * 1e6:.0f} us) {'ok' if batch_ok else 'FAIL'}")
+    return single_ok and batch_ok
+
+def bench_tsunami(limit=10.0, workers=4):
+    """A 1500 km basin over three hours must finish in seconds, identically when split across workers"""
+    serial = simulate_impact_tsunami(10000)
+    split = simulate_impact_tsunami(10000, workers=workers)
+    same = np.allclose(serial['max_amplitude'], split['max_amplitude'], equal_nan=True)
+    fast = serial['elapsed'] <= limit
+
+    print(f"1 worker         {serial['elapsed']:>8.2f} s  ({serial['steps']:,} steps, limit {limit:.0f} s) {'ok' if fast else 'FAIL'}")
+    print(f"{split['workers']} workers        {split['elapsed']:>8.2f} s  matches serial: {'ok' if same else 'FAIL'}")
+    return fast and same
+
+def bench_neo_search(rows=1_000_000, query_limit=0.01, name_limit=0.05):
+    """Combined filters and name lookups over a million objects must answer in milliseconds"""
+    rng = np.random.default_rng(0)
+    names = np.char.add(rng.integers(1, 999999, rows).astype('S7'),
+                        rng.choice([b' Apophis', b' Bennu', b' Eros', b' (2024 AB3)', b' (1999 XY)'], rows))
+    index = build_trigrams(build_search_index(
+        names, rng.random(rows) < 0.05,
+        diameter=rng.lognormal(5, 1, rows),
+        miss_distance=rng.uniform(1e5, 7.5e7, rows),
+        velocity=rng.uniform(3, 40, rows),
+        approach_date=np.datetime64('2026-01-01') + rng.integers(0, 3650, rows)
+    ))
+
+    # (label, query kwargs, limit)
+    cases = [
+        ("PHAs > 300 m, 90 days", dict(hazardous=True, diameter=(300, None),
+                                       approach_date=('2026-10-19', '2027-01-17')), query_limit),
+        ("close and fast", dict(miss_distance=(None, 1e6), velocity=(25, None)), query_limit),
+        ("name prefix", dict(name='12345'), name_limit),
+        ("name substring", dict(name='2024 ab', hazardous=True), name_limit)
+    ]
+    passed = True
+    for label, query, limit in cases:
+        elapsed = _best_time(lambda: query_index(index, **query), 10)
+        ok = elapsed <= limit
+        passed &= ok
+        print(f"{label:<22} {elapsed * 1e3:>8.2f} ms  {len(query_index(index, **query)):>7,} rows  "
+              f"(limit {limit * 1e3:.0f} ms) {'ok' if ok else 'FAIL'}")
+    return passed
+
+def _start_api(workers, timeout=30.0):
+    """Launch api_service.py on a free local port; returns the process and its base URL"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_service.py")
+    process = subprocess.Popen([sys.executable, path, '--port', str(port), '--workers', str(workers)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + timeout
+    while True:
+        try:
+            requests.get(base_url + "/health", timeout=1).raise_for_status()
+            return process, base_url
+        except requests.RequestException:
+            if process.poll() is not None or time.time() > deadline:
+                process.kill()
+                raise RuntimeError("api_service.py did not start")
+            time.sleep(0.1)
+
+def _api_throughput(url, body, clients, requests_per_client):
+    """Requests/s and p95 latency with clients posting one pre-encoded body concurrently"""
+    data = json.dumps(body).encode()
+    latencies = []
+
+    def client():
+        with requests.Session() as session:
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                response = session.post(url, data=data, headers={'Content-Type': 'application/json'})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        for future in [pool.submit(client) for _ in range(clients)]:
+            future.result()
+    return len(latencies) / (time.perf_counter() - start), float(np.percentile(latencies, 95))
+
+# (path, body, expected status, expected row count) for the service's batch validation
+API_CHECKS = [
+    ("/impact", {'diameter': [10, 20, 30], 'velocity': 12}, 200, 3),
+    ("/impact", [{'diameter': 10, 'velocity': 12, 'angle': None}, {'diameter': 20, 'velocity': 15}], 200, 2),
+    ("/impact", {'diameter': 10, 'velocity': 12, 'extra': [1, 2, 3]}, 400, None),
+    ("/impact", {'diameter': 10, 'diametr': [10, 20], 'velocity': 12}, 400, None),
+    ("/impact", [{'diametr': 10, 'velocity': 12}], 400, None),
+    ("/impact", {'diameter': True, 'velocity': 12}, 400, None),
+    ("/impact", {'diameter': ["10"], 'velocity': 12}, 400, None),
+    ("/impact", {'diameter': [10, None], 'velocity': 12}, 400, None),
+    ("/impact", {'diameter': [10, 20], 'velocity': [12, 13, 14]}, 400, None),
+    ("/impact", {'diameter': 10, 'velocity': 12, 'material': "Cheese"}, 400, None),
+    ("/defense?seed=1", {'strategy': ["Kinetic Impactor", "Nuclear Option"], 'asteroid_size': 300,
+                         'warning_time': [5, 10]}, 200, 2),
+    ("/defense", {'strategy': "Kinetic Impactor", 'asteroid_size': False, 'warning_time': 5}, 400, None)
+]
+
+def _check_api(base_url):
+    """Post each API_CHECKS body and compare status and row count"""
+    passed = True
+    for path, body, status, count in API_CHECKS:
+        response = requests.post(base_url + path, json=body)
+        ok = response.status_code == status and (count is None or response.json()['count'] == count)
+        passed &= ok
+        if not ok:
+            print(f"check {path} {json.dumps(body)[:60]}: {response.status_code} {response.text[:120]} "
+                  f"(expected {status}) FAIL")
+    print(f"{len(API_CHECKS)} request/response checks {'ok' if passed else 'FAIL'}")
+    return passed
+
+def bench_api(workers=2, clients=8, batch_rows=10_000, stream_rows=100_000, min_speedup=50.0):
+    """The service must validate batches as documented and serve rows far faster batched than one per request"""
+    rng = np.random.default_rng(0)
+    impacts = lambda rows: {'diameter': rng.uniform(10, 2000, rows).round(1).tolist(),
+                            'velocity': rng.uniform(11, 30, rows).round(2).tolist(),
+                            'angle': rng.uniform(15, 90, rows).round(1).tolist(),
+                            'material': "Granite"}
+    defenses = {'strategy': rng.choice(list(DEFENSE_BASE_SUCCESS), batch_rows).tolist(),
+                'asteroid_size': rng.uniform(10, 2000, batch_rows).round(1).tolist(),
+                'warning_time': rng.uniform(1, 20, batch_rows).round(1).tolist()}
+
+    # (label, path, body, rows per request, requests per client)
+    cases = [
+        ("impact x1", "/impact", impacts(1), 1, 50),
+        (f"impact x{batch_rows:,}", "/impact", impacts(batch_rows), batch_rows, 5),
+        ("impact+entry x1,000", "/impact?entry=true", impacts(1000), 1000, 2),
+        (f"defense x{batch_rows:,}", "/defense", defenses, batch_rows, 5),
+        (f"impact x{stream_rows:,} ndjson", "/impact?format=ndjson", impacts(stream_rows), stream_rows, 1)
+    ]
+    process, base_url = _start_api(workers)
+    rates = {}
+    try:
+        checked = _check_api(base_url)
+        print(f"{workers} workers, {clients} concurrent clients")
+        for label, path, body, rows, number in cases:
+            per_second, p95 = _api_throughput(base_url + path, body, clients, number)
+            rates[label] = per_second * rows
+            print(f"{label:<24} {per_second:>8,.1f} req/s  {per_second * rows:>12,.0f} rows/s  p95 {p95 * 1e3:>8,.1f} ms")
+    finally:
+        process.terminate()
+        process.wait(10)
+
+    speedup = rates[f"impact x{batch_rows:,}"] / rates["impact x1"]
+    ok = speedup >= min_speedup
+    print(f"batched vs single-row impact rows/s {speedup:,.0f}x (limit {min_speedup:.0f}x) {'ok' if ok else 'FAIL'}")
+    return ok and checked
+
+BENCHMARKS = {
+    'crater_scaling': bench_crater_scaling,
+    'atmospheric_entry': bench_atmospheric_entry,
+    'tsunami': bench_tsunami,
+    'neo_search': bench_neo_search,
+    'api': bench_api
+}
+
+def main(names):
+    failed = []
+    for name in names or BENCHMARKS:
+        print(f"== {name}")
+        if not BENCHMARKS[name]():
+            failed.append(name)
+    if failed:
+        print(f"FAILED: {', '.join(failed)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,151 @@
+import base64
+import re
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+SCATTER_POINT_LIMIT = 5000
+DENSITY_GRID_SIZE = 60
+COMPACT_MIN_LENGTH = 8  # shorter arrays are cheaper as plain JSON than as base64
+FLOAT32_TOLERANCE = 1e-4  # max float32 rounding error relative to the array's value range
+TYPED_INT_DTYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+HOVER_DECIMALS = re.compile(r'(\d+\.\d{2})\d+')
+
+def binned_histogram_trace(values, nbins=15, color='#FC3D21', opacity=0.8):
+    """Bin values on the server and return a bar trace carrying only the bins"""
+    values = np.asarray(values, dtype=float)
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=nbins)
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color=color,
+        opacity=opacity,
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate="%{customdata[0]:.0f} - %{customdata[1]:.0f}<br>Count: %{y}<extra></extra>",
+        showlegend=False
+    )
+
+def density_aggregate(x, y, size=None, grid_size=DENSITY_GRID_SIZE):
+    """Collapse points onto a grid, returning per-cell centroids, counts and mean size"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x_edges = np.linspace(x.min(), x.max(), grid_size + 1)
+    y_edges = np.linspace(y.min(), y.max(), grid_size + 1)
+    ix = np.clip(np.searchsorted(x_edges, x, side='right') - 1, 0, grid_size - 1)
+    iy = np.clip(np.searchsorted(y_edges, y, side='right') - 1, 0, grid_size - 1)
+    cell = ix * grid_size + iy
+
+    _, inverse, counts = np.unique(cell, return_inverse=True, return_counts=True)
+    aggregated = {
+        'x': np.bincount(inverse, weights=x) / counts,
+        'y': np.bincount(inverse, weights=y) / counts,
+        'count': counts
+    }
+    if size is not None:
+        aggregated['size'] = np.bincount(inverse, weights=np.asarray(size, dtype=float)) / counts
+    return aggregated
+
+def scatter_gl_traces(x, y, size, groups, color_map, labels, point_limit=SCATTER_POINT_LIMIT):
+    """WebGL scatter traces per group, density-aggregated when the group is too large"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    size = np.asarray(size, dtype=float)
+    groups = np.asarray(groups)
+    size_ref = max(float(np.nanmax(size)) if size.size else 1.0, 1e-9)
+
+    traces = []
+    for group, color in color_map.items():
+        mask = groups == group
+        if not mask.any():
+            continue
+        gx, gy, gsize = x[mask], y[mask], size[mask]
+        if mask.sum() > point_limit:
+            cells = density_aggregate(gx, gy, gsize)
+            gx, gy, gsize = cells['x'], cells['y'], cells['size']
+            hover = (f"{labels['x']}: %{{x:,.0f}}<br>{labels['y']}: %{{y:.1f}}"
+                     "<br>Objects: %{customdata:,}<extra>" + str(group) + "</extra>")
+            customdata = cells['count']
+            marker_size = 4 + 16 * np.sqrt(cells['count'] / cells['count'].max())
+        else:
+            hover = (f"{labels['x']}: %{{x:,.0f}}<br>{labels['y']}: %{{y:.1f}}"
+                     f"<br>{labels['size']}: %{{customdata:.0f}}<extra>" + str(group) + "</extra>")
+            customdata = gsize
+            marker_size = 4 + 16 * np.sqrt(gsize / size_ref)
+        traces.append(go.Scattergl(
+            x=gx, y=gy,
+            mode='markers',
+            name=str(group),
+            marker=dict(color=color, size=marker_size, opacity=0.7),
+            customdata=customdata,
+            hovertemplate=hover
+        ))
+    return traces
+
+def _decode_typed_array(spec):
+    """Decode a Plotly typed-array spec back into a NumPy array"""
+    values = np.frombuffer(base64.b64decode(spec['bdata']), dtype=spec['dtype'])
+    if 'shape' in spec:
+        values = values.reshape([int(n) for n in str(spec['shape']).split(',')])
+    return values
+
+def _encode_typed_array(values):
+    """Encode a NumPy array as a base64 Plotly typed-array spec"""
+    values = np.ascontiguousarray(values)
+    spec = {'dtype': values.dtype.str.lstrip('<|'), 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+    if values.ndim > 1:
+        spec['shape'] = ', '.join(str(n) for n in values.shape)
+    return spec
+
+def _narrow_array(values):
+    """Downcast to float32 or the smallest integer type that keeps the values intact"""
+    if values.dtype.kind == 'f' and values.dtype.itemsize > 4:
+        finite = values[np.isfinite(values)]
+        if finite.size == 0:
+            return values.astype(np.float32)
+        value_range = max(float(finite.max() - finite.min()), float(np.abs(finite).max()) * 1e-3, 1e-30)
+        narrowed = finite.astype(np.float32)
+        if np.isfinite(narrowed).all() and np.abs(narrowed - finite).max() <= FLOAT32_TOLERANCE * value_range:
+            return values.astype(np.float32)
+        return values
+    if values.dtype.kind in 'iub' and values.size:
+        low, high = values.min(), values.max()
+        for dtype in TYPED_INT_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return values.astype(dtype)
+    return values
+
+def _compact_value(key, value):
+    """Compact one trace property, recursing into nested property dicts"""
+    if isinstance(value, dict):
+        if 'bdata' in value and 'dtype' in value:
+            return _encode_typed_array(_narrow_array(_decode_typed_array(value)))
+        return {k: _compact_value(k, v) for k, v in value.items()}
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'fiu' and value.size >= COMPACT_MIN_LENGTH:
+        return _encode_typed_array(_narrow_array(value))
+    if isinstance(value, (list, tuple)) and len(value) >= COMPACT_MIN_LENGTH:
+        if key in ('text', 'hovertext') and all(isinstance(v, str) for v in value):
+            return [HOVER_DECIMALS.sub(r'\1', v) for v in value]
+        if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value):
+            return _encode_typed_array(_narrow_array(np.asarray(value)))
+    if key in ('text', 'hovertext') and isinstance(value, str):
+        return HOVER_DECIMALS.sub(r'\1', value)
+    return value
+
+def compact_figure(fig):
+    """Return a figure dict with numeric arrays as narrowed base64 typed arrays and rounded hover text"""
+    spec = fig.to_dict() if hasattr(fig, 'to_dict') else dict(fig)
+    spec['data'] = [{k: _compact_value(k, v) for k, v in trace.items()} for trace in spec.get('data', [])]
+    frames = spec.get('frames')
+    if frames:
+        spec['frames'] = [
+            {**frame, 'data': [{k: _compact_value(k, v) for k, v in trace.items()} for trace in frame.get('data', [])]}
+            for frame in frames
+        ]
+    return spec
+
+def figure_payload_bytes(fig):
+    """Size in bytes of the JSON spec a figure is sent to the browser as"""
+    return len(pio.to_json(fig, validate=False).encode('utf-8'))
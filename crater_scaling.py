@@ -0,0 +1,168 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+EARTH_GRAVITY = 9.81  # m/s²
+SIMPLE_TO_COMPLEX_DIAMETER = 3200.0  # m, final-crater transition diameter on Earth
+DEFAULT_PROJECTILE_DENSITY = 3000  # kg/m³, dense rock
+CRATER_CHUNK_SIZE = 16384  # bodies per batch step; keeps the temporaries cache-resident
+COMPLEX_CRATER_COEFFICIENT = 1.17 / SIMPLE_TO_COMPLEX_DIAMETER ** 0.13
+
+# Point-source pi-group scaling parameters per target (after Holsapple 1993):
+# target density (kg/m³), strength Y (Pa), K1, mu, nu and rim factor Kr.
+# The water K1 is calibrated to the Collins et al. (2005) water-target cavity.
+TARGET_MATERIALS = {
+    "Ocean": {'density': 1000, 'strength': 0.0, 'K1': 0.40, 'mu': 0.55, 'nu': 0.4, 'Kr': 1.1},
+    "Continental Crust": {'density': 2700, 'strength': 1.0e7, 'K1': 0.20, 'mu': 0.55, 'nu': 0.4, 'Kr': 1.1},
+    "Sedimentary Rock": {'density': 2250, 'strength': 7.6e6, 'K1': 0.20, 'mu': 0.55, 'nu': 0.4, 'Kr': 1.1},
+    "Granite": {'density': 2750, 'strength': 1.8e7, 'K1': 0.20, 'mu': 0.55, 'nu': 0.4, 'Kr': 1.1}
+}
+
+PROJECTILE_DENSITIES = {
+    "Cometary Ice": 1000,
+    "Porous Rock": 1500,
+    "Dense Rock": 3000,
+    "Iron": 7800
+}
+
+MATERIAL_INDEX = {name: i for i, name in enumerate(TARGET_MATERIALS)}
+
+def _build_scaling_table():
+    """Precompute per-target constants and exponents, one row per material"""
+    rows = []
+    for params in TARGET_MATERIALS.values():
+        mu, nu = params['mu'], params['nu']
+        rows.append((
+            params['density'],
+            params['strength'],
+            params['K1'],
+            params['Kr'],
+            (6 * nu - 2 - mu) / (3 * mu),  # density-ratio exponent, gravity term
+            (6 * nu - 2) / (3 * mu),  # density-ratio exponent, strength term
+            (2 + mu) / 2,  # strength-term exponent
+            -mu / (2 + mu)  # outer exponent, with the cube root of the volume folded in
+        ))
+    return np.array(rows, dtype=float)
+
+SCALING_TABLE = _build_scaling_table()
+
+def _scaling_constants(rho, strength, k1, kr, e_grav, e_str, p, q, density):
+    """Fold target and projectile properties into three coefficients per row
+
+    With U² the squared vertical impact speed and a the projectile radius,
+    the transient diameter becomes c_out * a * (c_grav * a / U² + c_str * U²^-p)^q.
+    """
+    density_ratio = rho / density
+    c_grav = EARTH_GRAVITY * density_ratio ** e_grav
+    c_str = (strength / rho * density_ratio ** e_str) ** p
+    c_out = 2 * kr * np.cbrt(k1 * (4 / 3) * np.pi * density / rho)
+    return c_grav, c_str, c_out, p, q
+
+@lru_cache(maxsize=256)
+def scaling_row(material, density=DEFAULT_PROJECTILE_DENSITY):
+    """Cached per-material lookup row for one projectile density"""
+    row = [float(v) for v in SCALING_TABLE[MATERIAL_INDEX[material]]]
+    return tuple(float(v) for v in _scaling_constants(*row, float(density)))
+
+def _final_crater_scalar(transient):
+    """Collapse a transient crater to its final rim diameter (Collins et al. 2005)"""
+    simple = 1.25 * transient
+    if simple <= SIMPLE_TO_COMPLEX_DIAMETER:
+        return simple
+    return 1.17 * transient ** 1.13 / SIMPLE_TO_COMPLEX_DIAMETER ** 0.13
+
+def _final_crater_batch(transient, out, workspace):
+    """Collapse transient craters to final rim diameters into out (complex craters take the power law)
+
+    transient holds the log of the transient diameter on entry and the diameter
+    on return; the power law is an exp of that log, as np.power costs ~2.5x an exp.
+    """
+    np.multiply(transient, 1.13, out=out)
+    np.exp(out, out=out)
+    out *= COMPLEX_CRATER_COEFFICIENT
+    np.exp(transient, out=transient)
+    simple = np.multiply(transient, 1.25, out=workspace)
+    np.putmask(out, simple <= SIMPLE_TO_COMPLEX_DIAMETER, simple)
+
+def _crater_scalar(diameter, velocity, angle, material, density):
+    """Scalar fast path using plain floats and the cached lookup row"""
+    c_grav, c_str, c_out, p, q = scaling_row(material, density)
+    radius = diameter / 2
+    # Only the vertical velocity component excavates
+    u = velocity * 1000 * math.sin(math.radians(angle))
+    u2 = u * u
+    scaled = c_grav * radius / u2
+    if c_str:
+        scaled += c_str * u2 ** -p
+    transient = c_out * radius * scaled ** q
+    return transient, _final_crater_scalar(transient)
+
+def _crater_chunk(diameter, velocity, angle, c_grav, c_str, c_out, p, q, transient, final, scratch):
+    """One chunk of the batch path, computed in place into transient and final
+
+    Works in logs with the speed in km/s; exp and log are far cheaper than
+    np.power. The 1000², the radius halving and c_out fold into the two
+    coefficients, leaving transient = diameter * scaled^q.
+    scratch is a chunk-sized workspace reused across chunks.
+    """
+    u2 = scratch[:transient.size]
+    outer = (0.5 * c_out) ** (1 / q)
+    # Only the vertical velocity component excavates. The sine runs in float32: ~1e-7
+    # relative error, far inside the scaling law's uncertainty, at a twentieth of the cost
+    np.sin(np.multiply(angle, math.pi / 180, dtype=np.float32), out=u2)
+    u2 *= velocity
+    np.square(u2, out=u2)
+    np.multiply(diameter, c_grav * 0.5e-6 * outer, out=transient)
+    transient /= u2
+    if np.any(c_str):
+        np.log(u2, out=u2)
+        u2 *= -p
+        np.exp(u2, out=u2)
+        u2 *= c_str * 1e6 ** -p * outer
+        transient += u2
+    np.log(transient, out=transient)
+    transient *= q
+    transient += np.log(diameter, out=u2)
+    _final_crater_batch(transient, final, u2)
+
+def _crater_batch(diameter, velocity, angle, material, density):
+    """Vectorized path; material and density may be scalars or arrays"""
+    if isinstance(material, str) and np.ndim(density) == 0:
+        constants = scaling_row(material, float(density))
+    else:
+        # Material only picks table rows, so give it the shape every input broadcasts to
+        common = np.broadcast_shapes(*(np.shape(x) for x in (diameter, velocity, angle, material, density)))
+        material = np.broadcast_to(np.asarray(material), common)
+        names, inverse = np.unique(material, return_inverse=True)
+        rows = SCALING_TABLE[[MATERIAL_INDEX[name] for name in names]][inverse.reshape(material.shape)]
+        constants = _scaling_constants(*np.moveaxis(rows, -1, 0), np.asarray(density, dtype=float))
+
+    inputs = (diameter, velocity, angle, *constants)
+    shape = np.broadcast_shapes(*(np.shape(x) for x in inputs))
+    # Scalars stay scalars; arrays are flattened to the common shape and walked chunk by chunk
+    inputs = [float(x) if np.ndim(x) == 0 else np.ravel(np.broadcast_to(np.asarray(x, dtype=float), shape))
+              for x in inputs]
+    transient = np.empty(shape)
+    final = np.empty(shape)
+    flat_transient, flat_final = transient.reshape(-1), final.reshape(-1)
+    scratch = np.empty(min(transient.size, CRATER_CHUNK_SIZE))
+    for start in range(0, max(transient.size, 1), CRATER_CHUNK_SIZE):
+        stop = start + CRATER_CHUNK_SIZE
+        _crater_chunk(*(x if isinstance(x, float) else x[start:stop] for x in inputs),
+                      flat_transient[start:stop], flat_final[start:stop], scratch)
+    return transient, final
+
+def _is_scalar(value):
+    return isinstance(value, (int, float, np.number))
+
+def crater_dimensions(diameter, velocity, angle, material, density=DEFAULT_PROJECTILE_DENSITY):
+    """Transient and final crater diameters (m) from pi-group scaling
+
+    diameter in meters, velocity in km/s, angle in degrees from horizontal.
+    Scalars take a plain-float fast path; arrays are evaluated vectorized.
+    """
+    if _is_scalar(diameter) and _is_scalar(velocity) and _is_scalar(angle) \
+            and _is_scalar(density) and isinstance(material, str):
+        return _crater_scalar(float(diameter), float(velocity), float(angle), material, float(density))
+    return _crater_batch(diameter, velocity, angle, material, density)
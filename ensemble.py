@@ -0,0 +1,136 @@
+import numpy as np
+
+from impact_models import calculate_defense_success_batch, calculate_impact_effects
+
+ENSEMBLE_CHUNK_SIZE = 16384
+ENSEMBLE_BINS = 200
+PHA_DISTANCE_KM = 7479894  # 0.05 AU, the MOID threshold for potentially hazardous asteroids
+
+# metric -> whether its histogram bins are log-spaced
+ENSEMBLE_METRICS = {
+    'diameter': False,
+    'velocity': False,
+    'miss_distance': False,
+    'energy_megatons': True,
+    'crater_diameter': True,
+    'seismic_magnitude': False,
+    'fireball_radius': True,
+    'defense_success': False
+}
+
+def neo_uncertainty_ranges(obj):
+    """Extract nominal values and uncertainty ranges from a NEO feed object"""
+    meters = obj['estimated_diameter']['meters']
+    approach = obj['close_approach_data'][0]
+    diameter_min = float(meters['estimated_diameter_min'])
+    return {
+        'name': obj['name'],
+        'diameter_min': diameter_min,
+        'diameter_max': float(meters.get('estimated_diameter_max', diameter_min)),
+        'velocity': float(approach['relative_velocity']['kilometers_per_second']),
+        'miss_distance': float(approach['miss_distance']['kilometers'])
+    }
+
+def sample_virtual_clones(ranges, count, rng, velocity_sigma=0.02, distance_sigma=0.05):
+    """Sample virtual asteroid clones from the uncertainty ranges of one NEO"""
+    diameter = rng.uniform(ranges['diameter_min'], ranges['diameter_max'], count)
+    # Relative sigmas, truncated at 3 sigma so the outcome bounds stay finite
+    velocity = ranges['velocity'] * (1 + velocity_sigma * np.clip(rng.standard_normal(count), -3, 3))
+    miss_distance = ranges['miss_distance'] * (1 + distance_sigma * np.clip(rng.standard_normal(count), -3, 3))
+    # Impact angles follow dP = sin(2θ) dθ, so sin²θ is uniformly distributed
+    angle = np.degrees(np.arcsin(np.sqrt(rng.uniform(0, 1, count))))
+    return {
+        'diameter': diameter,
+        'velocity': velocity,
+        'miss_distance': miss_distance,
+        'angle': np.clip(angle, 1, 90)
+    }
+
+def _ensemble_bin_edges(ranges, material, velocity_sigma, distance_sigma):
+    """Fixed histogram edges per metric, from the monotonic extremes of the models"""
+    v_lo = ranges['velocity'] * (1 - 3 * velocity_sigma)
+    v_hi = ranges['velocity'] * (1 + 3 * velocity_sigma)
+    low = calculate_impact_effects(ranges['diameter_min'], v_lo, 1, material)
+    high = calculate_impact_effects(ranges['diameter_max'], v_hi, 90, material)
+    bounds = {
+        'diameter': (ranges['diameter_min'], ranges['diameter_max']),
+        'velocity': (v_lo, v_hi),
+        'miss_distance': (ranges['miss_distance'] * (1 - 3 * distance_sigma),
+                          ranges['miss_distance'] * (1 + 3 * distance_sigma)),
+        'defense_success': (0.3, 0.98)
+    }
+    for key in ('energy_megatons', 'crater_diameter', 'seismic_magnitude', 'fireball_radius'):
+        bounds[key] = (low[key], high[key])
+
+    edges = {}
+    for key, log_scale in ENSEMBLE_METRICS.items():
+        lo, hi = bounds[key]
+        if hi <= lo:
+            hi = lo + max(abs(lo) * 1e-6, 1e-9)
+        if log_scale:
+            edges[key] = np.geomspace(max(lo, 1e-12), hi, ENSEMBLE_BINS + 1)
+        else:
+            edges[key] = np.linspace(lo, hi, ENSEMBLE_BINS + 1)
+    return edges
+
+def _histogram_percentiles(counts, edges, percentiles):
+    """Interpolate percentiles from an accumulated histogram"""
+    cumulative = np.concatenate([[0], np.cumsum(counts)])
+    targets = np.asarray(percentiles) / 100 * cumulative[-1]
+    return np.interp(targets, cumulative, edges)
+
+def run_uncertainty_ensemble(ranges, material, defense_strategy, warning_time,
+                             clones=100000, seed=None, chunk_size=ENSEMBLE_CHUNK_SIZE,
+                             velocity_sigma=0.02, distance_sigma=0.05):
+    """Propagate virtual clones through the impact and defense models in bounded-memory chunks"""
+    rng = np.random.default_rng(seed)
+    edges = _ensemble_bin_edges(ranges, material, velocity_sigma, distance_sigma)
+    counts = {key: np.zeros(ENSEMBLE_BINS, dtype=np.int64) for key in ENSEMBLE_METRICS}
+    sums = dict.fromkeys(ENSEMBLE_METRICS, 0.0)
+    close_count = 0
+
+    for start in range(0, clones, chunk_size):
+        n = min(chunk_size, clones - start)
+        sample = sample_virtual_clones(ranges, n, rng, velocity_sigma, distance_sigma)
+        effects = calculate_impact_effects(sample['diameter'], sample['velocity'], sample['angle'], material)
+        success_rate, _ = calculate_defense_success_batch(
+            defense_strategy, sample['diameter'], np.full(n, warning_time), rng
+        )
+
+        values = {
+            'diameter': sample['diameter'],
+            'velocity': sample['velocity'],
+            'miss_distance': sample['miss_distance'],
+            'defense_success': success_rate
+        }
+        for key in ('energy_megatons', 'crater_diameter', 'seismic_magnitude', 'fireball_radius'):
+            values[key] = effects[key]
+
+        for key, metric in values.items():
+            # Clip so float rounding at the extremes still lands in the outer bins
+            clipped = np.clip(metric, edges[key][0], edges[key][-1])
+            counts[key] += np.histogram(clipped, bins=edges[key])[0]
+            sums[key] += float(metric.sum())
+        close_count += int(np.count_nonzero(sample['miss_distance'] < PHA_DISTANCE_KM))
+
+    summary = {}
+    for key in ENSEMBLE_METRICS:
+        p5, p50, p95 = _histogram_percentiles(counts[key], edges[key], [5, 50, 95])
+        summary[key] = {
+            'mean': sums[key] / clones,
+            'p5': p5,
+            'p50': p50,
+            'p95': p95,
+            'counts': counts[key],
+            'edges': edges[key]
+        }
+
+    return {
+        'name': ranges['name'],
+        'clones': clones,
+        'material': material,
+        'defense_strategy': defense_strategy,
+        'warning_time': warning_time,
+        'pha_distance_fraction': close_count / clones,
+        'metrics': summary
+    }
@@ -0,0 +1,118 @@
+import numpy as np
+import random
+
+from atmospheric_entry import simulate_atmospheric_entry
+from crater_scaling import DEFAULT_PROJECTILE_DENSITY, crater_dimensions
+
+# km per kt^(1/3): slant range of ~14 kPa (2 psi) blast overpressure, enough to flatten
+# forest; puts a ~10 Mt burst at ~8.5 km near Tunguska's ~2,000 km² of felled trees
+AIRBURST_DAMAGE_RANGE = 1.2
+
+DEFENSE_BASE_SUCCESS = {
+    "Kinetic Impactor": 0.85,
+    "Gravity Tractor": 0.70,
+    "Nuclear Option": 0.95
+}
+
+def calculate_defense_success(defense_strategy, asteroid_size, warning_time, rng=random):
+    """Calculate defense success probability"""
+    size_factor = max(0.1, 1 - (asteroid_size / 2000))
+    time_factor = min(1.0, warning_time / 10)
+
+    success_rate = DEFENSE_BASE_SUCCESS[defense_strategy] * size_factor * time_factor
+    success_rate = min(0.98, max(0.3, success_rate))
+
+    miss_distance = rng.randint(5000, 50000) * (success_rate / 0.85)
+
+    return success_rate, miss_distance
+
+def calculate_defense_success_batch(defense_strategy, asteroid_size, warning_time, rng=None):
+    """Vectorized defense success over arrays of asteroid sizes and warning times"""
+    rng = np.random.default_rng() if rng is None else rng
+    asteroid_size = np.asarray(asteroid_size, dtype=float)
+    warning_time = np.asarray(warning_time, dtype=float)
+
+    size_factor = np.maximum(0.1, 1 - (asteroid_size / 2000))
+    time_factor = np.minimum(1.0, warning_time / 10)
+
+    success_rate = DEFENSE_BASE_SUCCESS[defense_strategy] * size_factor * time_factor
+    success_rate = np.clip(success_rate, 0.3, 0.98)
+
+    miss_distance = rng.integers(5000, 50001, size=success_rate.shape) * (success_rate / 0.85)
+
+    return success_rate, miss_distance
+
+def calculate_impact_effects(diameter, velocity, angle, material, density=DEFAULT_PROJECTILE_DENSITY):
+    """Calculate dynamic impact effects (scalars or equally shaped NumPy arrays)"""
+    mass = (4/3) * np.pi * ((diameter/2)**3) * density
+    energy_joules = 0.5 * mass * (velocity * 1000)**2
+    energy_megatons = energy_joules / (4.184e15)
+
+    transient_crater_diameter, crater_diameter = crater_dimensions(diameter, velocity, angle, material, density)
+    seismic_magnitude = 4.5 + (np.log10(energy_joules) - 12) / 1.5
+    fireball_radius = 50 * (energy_megatons ** 0.4)
+
+    angle_factor = angle / 90
+    velocity_factor = velocity / 30
+
+    distribution = {
+        'Crater Formation': 35 + (15 * angle_factor),
+        'Seismic Waves': 20 + (10 * velocity_factor),
+        'Thermal Radiation': 25 + (5 * velocity_factor),
+        'Ejecta & Debris': 20 + (10 * (1 - angle_factor))
+    }
+
+    total = sum(distribution.values())
+    for key in distribution:
+        distribution[key] = (distribution[key] / total) * 100
+
+    return {
+        'energy_megatons': energy_megatons,
+        'crater_diameter': crater_diameter,
+        'transient_crater_diameter': transient_crater_diameter,
+        'seismic_magnitude': seismic_magnitude,
+        'fireball_radius': fireball_radius,
+        'affected_area': crater_diameter * 3,
+        'impact_distribution': distribution
+    }
+
+def calculate_impact_with_entry(diameter, velocity, angle, material, density=DEFAULT_PROJECTILE_DENSITY,
+                                return_profile=False):
+    """Atmospheric entry followed by the ground impact of whatever survives it"""
+    scalar = all(np.ndim(x) == 0 for x in (diameter, velocity, angle, density))
+    entry = simulate_atmospheric_entry(diameter, velocity, angle, density, return_profile=return_profile)
+    shape = np.broadcast(diameter, velocity, angle, density).shape
+
+    # The surviving mass hits as an equivalent sphere at its residual velocity
+    ground_diameter = (np.broadcast_to(diameter, shape).ravel()
+                       * np.cbrt(entry['residual_mass_fraction']))
+    ground_velocity = np.maximum(entry['residual_velocity'], 1e-3)
+    ground = calculate_impact_effects(ground_diameter, ground_velocity,
+                                      np.broadcast_to(angle, shape).ravel(), material,
+                                      np.broadcast_to(density, shape).ravel())
+    reaches_ground = ~entry['airburst']
+
+    results = calculate_impact_effects(diameter, velocity, angle, material, density)
+    for key in ('crater_diameter', 'transient_crater_diameter'):
+        results[key] = np.where(reaches_ground, ground[key], 0.0).reshape(shape)
+    # Airbursts damage the ground out to where the blast's slant range meets it
+    slant_range = AIRBURST_DAMAGE_RANGE * np.cbrt(entry['energy_deposited_megatons'] * 1000)
+    burst_height = np.nan_to_num(entry['burst_altitude']) / 1000
+    blast_area = np.pi * np.maximum(slant_range ** 2 - burst_height ** 2, 0.0)
+    results['affected_area'] = np.where(reaches_ground, ground['affected_area'], blast_area).reshape(shape)
+    # An airburst has no ground impact to produce a seismic magnitude
+    results['seismic_magnitude'] = np.where(reaches_ground, ground['seismic_magnitude'], np.nan).reshape(shape)
+    for key in ('energy_deposited_megatons', 'residual_velocity', 'burst_altitude', 'breakup_altitude', 'airburst'):
+        results[key] = entry[key].reshape(shape)
+    results['ground_energy_megatons'] = entry['residual_energy_megatons'].reshape(shape)
+
+    if scalar:
+        for key, value in results.items():
+            if isinstance(value, np.ndarray):
+                results[key] = value.item()
+    if return_profile:
+        results['deposition_profile'] = {
+            'altitude': entry['profile_altitude'],
+            'megatons_per_km': entry['profile_megatons_per_km'][:, 0] if scalar else entry['profile_megatons_per_km']
+        }
+    return results
@@ -0,0 +1,164 @@
+"""Concurrent-session load test: python load_test.py [--sessions 1,2,4,8] [--reruns 5]
+
+Serves seeded synthetic NASA NEO and USGS feeds from a local fake upstream,
+points the app's background refresh at it (lifting the app's cap on shown
+earthquakes, so sessions render every generated event) and drives
+simultaneous headless sessions of app.py through Streamlit's AppTest. Prints rerun latency
+percentiles, throughput and peak resident memory for each session count.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from refresh_scheduler import latest
+from synthetic_feeds import synthetic_neo_feed, synthetic_usgs_feed
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+NEO_PATH = "/neo/rest/v1/feed"
+USGS_PATH = "/earthquakes/feed/v1.0/summary/4.5_week.geojson"
+SEARCH_TERMS = ["", "20", "2019 k", "ab", "", "199"]
+SESSION_TIMEOUT = 300  # s per script run
+
+def start_fake_upstream(neo_feed, usgs_feed):
+    """Serve both feeds from pre-encoded JSON on a free local port; returns the server and its base URL"""
+    bodies = {NEO_PATH: json.dumps(neo_feed).encode(), USGS_PATH: json.dumps(usgs_feed).encode()}
+
+    class FeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = bodies.get(self.path.split('?')[0])
+            self.send_response(200 if body else 404)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body or b'')))
+            self.end_headers()
+            self.wfile.write(body or b'')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def current_rss():
+    """Resident set size in bytes (peak so far where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+def _sample_peak_rss(stop, peak, interval=0.05):
+    while not stop.wait(interval):
+        peak[0] = max(peak[0], current_rss())
+
+def _new_session(secrets):
+    at = AppTest.from_file(APP_PATH, default_timeout=SESSION_TIMEOUT)
+    for key, value in secrets.items():
+        at.secrets[key] = value
+    return at
+
+def _run_session(secrets, reruns, seed, start, latencies, errors):
+    """One user: a cold page load, then reruns that alternate plain reruns with search queries"""
+    rng = np.random.default_rng(seed)
+    at = _new_session(secrets)
+    start.wait()
+    try:
+        t0 = time.perf_counter()
+        at.run()
+        latencies['cold'].append(time.perf_counter() - t0)
+        for i in range(reruns):
+            if i % 2:
+                at.text_input(key="search_name").set_value(SEARCH_TERMS[rng.integers(len(SEARCH_TERMS))])
+            t0 = time.perf_counter()
+            at.run()
+            latencies['warm'].append(time.perf_counter() - t0)
+            errors.extend(str(e.value) for e in at.exception)
+    except Exception as exc:
+        errors.append(f"{type(exc).__name__}: {exc}")
+
+def run_level(sessions, reruns, secrets, seed=0):
+    """Run sessions users at once and summarize their rerun latencies, throughput and memory"""
+    latencies = {'cold': [], 'warm': []}
+    errors = []
+    start = threading.Barrier(sessions + 1)
+    threads = [threading.Thread(target=_run_session, args=(secrets, reruns, seed + k, start, latencies, errors))
+               for k in range(sessions)]
+    for thread in threads:
+        thread.start()
+
+    stop = threading.Event()
+    peak = [current_rss()]
+    sampler = threading.Thread(target=_sample_peak_rss, args=(stop, peak), daemon=True)
+    sampler.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    sampler.join()
+
+    warm = np.array(latencies['warm']) * 1000
+    percentile = lambda q: float(np.percentile(warm, q)) if warm.size else float('nan')
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies['cold']) + warm.size,
+        'cold_p50': float(np.median(latencies['cold'])) * 1000 if latencies['cold'] else float('nan'),
+        'p50': percentile(50),
+        'p95': percentile(95),
+        'p99': percentile(99),
+        'throughput': (len(latencies['cold']) + warm.size) / elapsed,
+        'peak_rss_mb': peak[0] / 2 ** 20,
+        'errors': errors
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', default='1,2,4,8', help="comma-separated concurrent session counts")
+    parser.add_argument('--reruns', type=int, default=5, help="reruns per session after its first page load")
+    parser.add_argument('--neo-objects', type=int, default=2000)
+    parser.add_argument('--earthquakes', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    neo_feed = synthetic_neo_feed(args.neo_objects, seed=args.seed)
+    usgs_feed = synthetic_usgs_feed(args.earthquakes, seed=args.seed)
+    server, base_url = start_fake_upstream(neo_feed, usgs_feed)
+    secrets = {'NEO_FEED_URL': base_url + NEO_PATH, 'USGS_FEED_URL': base_url + USGS_PATH,
+               'USGS_EVENT_LIMIT': args.earthquakes}
+    print(f"fake upstream at {base_url}: {args.neo_objects:,} NEOs, {args.earthquakes:,} earthquakes")
+
+    # One warm-up page load starts the background refresh; wait until it has published the fake feeds
+    _new_session(secrets).run()
+    deadline = time.time() + 60
+    while not (latest('neo')['live'] and latest('usgs')['live']):
+        if time.time() > deadline:
+            server.shutdown()
+            sys.exit("background refresh never reached the fake upstream")
+        time.sleep(0.1)
+
+    print(f"{'sessions':>8} {'reruns':>7} {'cold p50':>9} {'p50':>8} {'p95':>8} {'p99':>8} "
+          f"{'reruns/s':>9} {'peak RSS':>9} {'errors':>7}")
+    failed = False
+    for sessions in (int(n) for n in args.sessions.split(',')):
+        level = run_level(sessions, args.reruns, secrets, seed=args.seed)
+        failed |= bool(level['errors'])
+        print(f"{level['sessions']:>8} {level['reruns']:>7} {level['cold_p50']:>7.0f}ms {level['p50']:>6.0f}ms "
+              f"{level['p95']:>6.0f}ms {level['p99']:>6.0f}ms {level['throughput']:>9.2f} "
+              f"{level['peak_rss_mb']:>7.0f}MB {len(level['errors']):>7}")
+        for error in level['errors'][:3]:
+            print(f"         {error}")
+    server.shutdown()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
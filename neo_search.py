@@ -0,0 +1,188 @@
+import numpy as np
+
+from sbdb_catalog import encounter_velocity
+
+NAME_WIDTH = 32  # bytes kept per normalized name
+
+def _normalize_names(names):
+    """Lower-case ASCII bytes, without the parentheses NASA puts around provisional designations"""
+    names = np.asarray(names)
+    if names.dtype.kind != 'S':
+        names = np.char.encode(np.asarray(names, dtype=str), 'ascii', 'replace')
+    names = np.char.strip(np.char.lower(names.astype(f'S{NAME_WIDTH}')))
+    return np.char.strip(np.char.replace(np.char.replace(names, b'(', b''), b')', b''))
+
+def _trigram_codes(raw):
+    """Every 3-byte window of fixed-width names as a 24-bit code, plus a mask of windows inside the name"""
+    codes = raw.view(np.uint8).reshape(len(raw), raw.dtype.itemsize).astype(np.int32)
+    trigrams = (codes[:, :-2] << 16) | (codes[:, 1:-1] << 8) | codes[:, 2:]
+    return trigrams, codes[:, 2:] != 0
+
+def _build_trigram_index(raw):
+    """Posting lists as one (trigram, row) array pair sorted by trigram, then row"""
+    if raw.dtype.itemsize < 3 or not len(raw):
+        return {'trigrams': np.zeros(0, dtype=np.int32), 'rows': np.zeros(0, dtype=np.int32)}
+    trigrams, inside = _trigram_codes(raw)
+    rows = np.broadcast_to(np.arange(len(raw), dtype=np.int64)[:, None], trigrams.shape)[inside]
+    # One sort over a combined key both groups the postings and drops repeats within a name
+    keys = np.sort(trigrams[inside].astype(np.int64) * len(raw) + rows)
+    keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+    return {'trigrams': (keys // len(raw)).astype(np.int32), 'rows': (keys % len(raw)).astype(np.int32)}
+
+def _to_days(values):
+    """Dates (strings, datetimes or datetime64) as integer days since the epoch"""
+    return np.asarray(values, dtype='datetime64[D]').astype(np.int64)
+
+def build_search_index(names, hazardous, **columns):
+    """Index a table of objects for range, hazard and name queries
+
+    columns are equal-length arrays keyed by name, e.g. diameter (m),
+    miss_distance (km), velocity (km/s) and approach_date (dates). Each gets
+    a sorted copy plus the row order; hazardous gets bitmaps for both flags.
+    """
+    hazardous = np.asarray(hazardous, dtype=bool)
+    index = {'size': len(hazardous), 'values': {}, 'sorted': {}, 'order': {}}
+    for column, values in columns.items():
+        if values is None:
+            continue
+        values = _to_days(values) if column == 'approach_date' else np.asarray(values, dtype=float)
+        order = np.argsort(values, kind='stable')
+        index['values'][column] = values
+        index['sorted'][column] = values[order]
+        index['order'][column] = order
+
+    index['hazardous'] = {True: hazardous, False: ~hazardous}
+
+    raw = _normalize_names(names)
+    name_order = np.argsort(raw, kind='stable')
+    index['labels'] = np.asarray(names)
+    index['names'] = raw
+    index['sorted_names'] = raw[name_order]
+    index['name_order'] = name_order
+    # Trigram postings are the expensive part; build_trigrams adds them up front,
+    # otherwise the first substring search builds them
+    index['trigrams'] = None
+    return index
+
+def build_trigrams(index):
+    """Build the trigram postings for substring search if missing; returns the index
+
+    Call this where the index is built and cached, so the first substring
+    search does not pay for it and shared indexes are not mutated mid-query.
+    """
+    if index['trigrams'] is None:
+        index['trigrams'] = _build_trigram_index(index['names'])
+    return index
+
+def index_neo_feed(neo_data):
+    """Search index over the objects of a NASA NEO feed (or the simulated feed)"""
+    names, hazardous, diameter, miss_distance, velocity, approach_date = [], [], [], [], [], []
+    for date, day_objects in neo_data['near_earth_objects'].items():
+        for obj in day_objects:
+            try:
+                approach = obj['close_approach_data'][0]
+                row = (float(obj['estimated_diameter']['meters']['estimated_diameter_min']),
+                       float(approach['miss_distance']['kilometers']),
+                       float(approach['relative_velocity']['kilometers_per_second']))
+            except (KeyError, ValueError, IndexError):
+                continue
+            diameter.append(row[0])
+            miss_distance.append(row[1])
+            velocity.append(row[2])
+            approach_date.append(approach.get('close_approach_date', date))
+            names.append(obj.get('name', obj.get('id', '')))
+            hazardous.append(bool(obj.get('is_potentially_hazardous_asteroid', False)))
+
+    return build_search_index(names, hazardous, diameter=diameter, miss_distance=miss_distance,
+                              velocity=velocity, approach_date=approach_date)
+
+def index_catalog(catalog):
+    """Search index over an SBDB catalog: names, diameter, encounter velocity and the PHA flag"""
+    return build_search_index(catalog['name'], catalog['pha'], diameter=catalog['diameter'],
+                              velocity=encounter_velocity(catalog))
+
+def _range_rows(index, column, low, high):
+    """Rows with low <= value <= high, by bisecting the column's sorted array"""
+    if column not in index['sorted']:
+        raise ValueError(f"No '{column}' index; indexed columns are {', '.join(index['sorted'])}")
+    if column == 'approach_date':
+        low = None if low is None else _to_days(low)
+        high = None if high is None else _to_days(high)
+    values = index['sorted'][column]
+    start = 0 if low is None else np.searchsorted(values, low, side='left')
+    stop = len(values) if high is None else np.searchsorted(values, high, side='right')
+    return index['order'][column][start:stop]
+
+def _prefix_rows(index, prefix):
+    """Rows whose normalized name starts with prefix"""
+    names = index['sorted_names']
+    start = np.searchsorted(names, prefix, side='left')
+    stop = np.searchsorted(names, prefix + b'\xff', side='left')
+    return index['name_order'][start:stop]
+
+def _substring_rows(index, text):
+    """Rows whose normalized name contains text, via trigram postings then a verifying scan"""
+    postings = build_trigrams(index)['trigrams']
+    query = np.frombuffer(text, dtype=np.uint8).astype(np.int32)
+    codes = np.unique((query[:-2] << 16) | (query[1:-1] << 8) | query[2:])
+
+    bounds = [(np.searchsorted(postings['trigrams'], c, side='left'),
+               np.searchsorted(postings['trigrams'], c, side='right')) for c in codes]
+    # Intersect the shortest posting lists first
+    candidates = None
+    for start, stop in sorted(bounds, key=lambda b: b[1] - b[0]):
+        rows = postings['rows'][start:stop]
+        candidates = rows if candidates is None else np.intersect1d(candidates, rows, assume_unique=True)
+        if not candidates.size:
+            return candidates
+    return candidates[np.char.find(index['names'][candidates], text) >= 0]
+
+def _name_rows(index, name):
+    """Prefix matches first, then (for 3+ characters) names containing the text anywhere"""
+    text = _normalize_names([name])[0]
+    if not text:
+        return None
+    prefix = np.sort(_prefix_rows(index, text))
+    if len(text) < 3:
+        return prefix
+    anywhere = _substring_rows(index, text)
+    return np.concatenate([prefix, np.setdiff1d(anywhere, prefix, assume_unique=True)])
+
+def query_index(index, name=None, hazardous=None, limit=None, **ranges):
+    """Row numbers matching every given filter
+
+    ranges map an indexed column to an inclusive (low, high) pair, either end
+    None for open, e.g. diameter=(300, None). The most selective range is
+    bisected; the other filters are checked on its rows only. Rows come back
+    in table order, except that name prefix matches rank first.
+    """
+    name_rows = _name_rows(index, name) if name else None
+    bounds = {column: bound for column, bound in ranges.items() if bound is not None}
+
+    candidates = name_rows
+    if bounds:
+        # Size each range by bisection alone, then materialize only the smallest
+        sized = {column: _range_rows(index, column, *bound) for column, bound in bounds.items()}
+        driver = min(sized, key=lambda column: len(sized[column]))
+        if candidates is None:
+            candidates = np.sort(sized[driver])
+        for column, (low, high) in bounds.items():
+            if column == driver and name_rows is None:
+                continue
+            values = index['values'][column][candidates]
+            if column == 'approach_date':
+                low = None if low is None else _to_days(low)
+                high = None if high is None else _to_days(high)
+            keep = np.ones(len(candidates), dtype=bool)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            candidates = candidates[keep]
+
+    if hazardous is not None:
+        bitmap = index['hazardous'][bool(hazardous)]
+        candidates = np.flatnonzero(bitmap) if candidates is None else candidates[bitmap[candidates]]
+    if candidates is None:
+        candidates = np.arange(index['size'])
+    return candidates[:limit] if limit is not None else candidates
@@ -0,0 +1,207 @@
+import zlib
+from datetime import datetime, timezone
+
+import numpy as np
+import plotly.graph_objects as go
+
+from charts import compact_figure, figure_payload_bytes
+
+MAX_ORBIT_OBJECTS = 15
+OBJECTS_PER_DAY = 5
+FRAME_STEP = 3600.0  # s, finest time step offered before decimation
+ANIMATION_BYTE_BUDGET = 512 * 1024  # bytes of compacted figure JSON, frames included
+PLAYBACK_SECONDS = 12.0  # wall time for one pass over the window
+MIN_FRAME_DURATION = 40  # ms
+
+def feed_orbits(neo_data, max_objects=MAX_ORBIT_OBJECTS, per_day=OBJECTS_PER_DAY):
+    """Illustrative geocentric orbits for the first few objects of each feed day, as arrays
+
+    Each object circles Earth at its miss distance with an offset seeded
+    from its id, so the same feed always draws the same paths. The
+    object sits at the start of its path (angle 0) at close approach and
+    sweeps it at its relative velocity.
+    """
+    rows = []
+    for date, objects in neo_data['near_earth_objects'].items():
+        for obj in objects[:per_day]:
+            try:
+                approach = obj['close_approach_data'][0]
+                distance = float(approach['miss_distance']['kilometers'])
+                velocity = float(approach['relative_velocity']['kilometers_per_second'])
+                diameter = float(obj['estimated_diameter']['meters']['estimated_diameter_min'])
+            except (KeyError, ValueError, IndexError):
+                continue
+            if 'epoch_date_close_approach' in approach:
+                approach_time = float(approach['epoch_date_close_approach']) / 1000
+            else:
+                day = datetime.strptime(approach.get('close_approach_date', date), '%Y-%m-%d')
+                approach_time = day.replace(hour=12, tzinfo=timezone.utc).timestamp()
+            seed = zlib.crc32(str(obj.get('id', obj['name'])).encode())
+            offset = np.random.default_rng(seed).uniform(-2, 2, 2)
+            rows.append((obj['name'], bool(obj['is_potentially_hazardous_asteroid']), diameter, velocity,
+                         distance, approach_time, offset[0], offset[1]))
+            if len(rows) >= max_objects:
+                break
+        if len(rows) >= max_objects:
+            break
+
+    columns = list(zip(*rows)) if rows else [()] * 8
+    names, hazardous, diameter, velocity, distance, approach_time, offset_x, offset_y = columns
+    return {
+        'name': list(names),
+        'hazardous': np.array(hazardous, dtype=bool),
+        'diameter': np.array(diameter, dtype=float),
+        'velocity': np.array(velocity, dtype=float),
+        'radius': np.array(distance, dtype=float) / 1000,  # plot units of 1000 km
+        'approach_time': np.array(approach_time, dtype=float),
+        'angular_rate': np.array(velocity, dtype=float) / np.maximum(np.array(distance, dtype=float), 1.0),
+        'offset_x': np.array(offset_x, dtype=float),
+        'offset_y': np.array(offset_y, dtype=float)
+    }
+
+def orbit_track_positions(orbits, phase):
+    """Positions on each object's path at the given phase angles (radians), broadcast per object"""
+    r = orbits['radius'][:, None]
+    phase = np.asarray(phase, dtype=float)
+    return (r * np.cos(phase) + orbits['offset_x'][:, None],
+            r * np.sin(phase) + orbits['offset_y'][:, None],
+            r * 0.3 * np.sin(phase))
+
+def animation_positions(orbits, times):
+    """Positions of every object at every time (s since epoch) in one pass, shape (objects, frames)"""
+    phase = orbits['angular_rate'][:, None] * (np.asarray(times, dtype=float)[None, :] - orbits['approach_time'][:, None])
+    return orbit_track_positions(orbits, phase)
+
+def decimate_frames(frame_count, frame_bytes, base_bytes, byte_budget):
+    """Evenly spaced frame indices whose total payload fits the budget, keeping the last frame
+
+    At least one frame is always kept, so a base figure that alone exceeds
+    the budget still overruns it; callers check the final size.
+    """
+    affordable = max(1, int((byte_budget - base_bytes) // max(frame_bytes, 1)))
+    if affordable >= frame_count:
+        return np.arange(frame_count)
+    return np.unique(np.linspace(0, frame_count - 1, affordable).round().astype(int))
+
+def _frame(k, x, y, z, marker_trace, label):
+    return go.Frame(data=[go.Scatter3d(x=x[:, k], y=y[:, k], z=z[:, k])], traces=[marker_trace], name=label)
+
+def _frame_label(t):
+    return datetime.fromtimestamp(t, tz=timezone.utc).strftime('%b %d %H:%M')
+
+def build_orbit_animation(neo_data, byte_budget=ANIMATION_BYTE_BUDGET, frame_step=FRAME_STEP):
+    """Compacted figure spec animating every object along its path across the feed window
+
+    All positions are computed up front and shipped as Plotly frames, so the
+    play button and slider run in the browser without a rerun per frame.
+    Frames are thinned until the spec fits byte_budget; only a base figure
+    too large for even one frame overruns it, flagged as over_budget in the
+    returned summary of the frames kept.
+    """
+    orbits = feed_orbits(neo_data)
+    dates = sorted(neo_data['near_earth_objects'])
+    start = datetime.strptime(dates[0], '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp() if dates else 0.0
+    end = datetime.strptime(dates[-1], '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp() + 86400 if dates else 86400.0
+    times = np.arange(start, end + frame_step / 2, frame_step)
+
+    x_track, y_track, z_track = orbit_track_positions(orbits, np.linspace(0, 2 * np.pi, 100))
+    x, y, z = animation_positions(orbits, times)
+
+    fig = go.Figure()
+    u = np.linspace(0, 2 * np.pi, 40)
+    v = np.linspace(0, np.pi, 40)
+    fig.add_trace(go.Surface(
+        x=6371 * np.outer(np.cos(u), np.sin(v)),
+        y=6371 * np.outer(np.sin(u), np.sin(v)),
+        z=6371 * np.outer(np.ones(u.size), np.cos(v)),
+        colorscale=[[0, '#1f77b4'], [1, '#1f77b4']],
+        showscale=False,
+        opacity=0.7,
+        name="Earth",
+        hoverinfo='skip'
+    ))
+    colors = np.where(orbits['hazardous'], 'red', 'green')
+    for k, name in enumerate(orbits['name']):
+        fig.add_trace(go.Scatter3d(
+            x=x_track[k], y=y_track[k], z=z_track[k],
+            mode='lines',
+            line=dict(width=2, color=colors[k]),
+            name=name,
+            hoverinfo='skip',
+            showlegend=False
+        ))
+    marker_trace = len(fig.data)
+    fig.add_trace(go.Scatter3d(
+        x=x[:, 0], y=y[:, 0], z=z[:, 0],
+        mode='markers',
+        marker=dict(size=np.maximum(5, orbits['diameter'] / 50), color=colors, opacity=0.9),
+        text=[f"{name}<br>Diameter: {d:.0f}m<br>Velocity: {s:.1f} km/s<br>Hazardous: {h}"
+              for name, d, s, h in zip(orbits['name'], orbits['diameter'], orbits['velocity'], orbits['hazardous'])],
+        hoverinfo='text',
+        name="Asteroids",
+        showlegend=False
+    ))
+    fig.update_layout(
+        title="",
+        scene=dict(
+            xaxis_title="X (1000 km)",
+            yaxis_title="Y (1000 km)",
+            zaxis_title="Z (1000 km)",
+            bgcolor='black',
+            camera=dict(eye=dict(x=2, y=2, z=1)),
+            aspectmode='data'
+        ),
+        height=650,
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+
+    # Size one compacted frame (plus its slider step) to see how many the budget affords
+    sample = compact_figure({'data': [], 'frames': [_frame(0, x, y, z, marker_trace, _frame_label(times[0])).to_plotly_json()]})
+    frame_bytes = figure_payload_bytes(sample['frames'][0]) + 160
+    base_bytes = figure_payload_bytes(compact_figure(fig)) + 1000
+    kept = decimate_frames(len(times), frame_bytes, base_bytes, byte_budget)
+
+    while True:
+        labels = [_frame_label(times[k]) for k in kept]
+        fig.frames = [_frame(k, x, y, z, marker_trace, label) for k, label in zip(kept, labels)]
+        duration = max(MIN_FRAME_DURATION, int(PLAYBACK_SECONDS * 1000 / max(len(kept), 1)))
+        play = dict(frame=dict(duration=duration, redraw=True), transition=dict(duration=0), fromcurrent=True, mode='immediate')
+        fig.update_layout(
+            updatemenus=[dict(
+                type='buttons',
+                direction='left',
+                x=0.0, y=0.0, xanchor='left', yanchor='top',
+                pad=dict(t=40, r=10),
+                buttons=[
+                    dict(label="▶ Play", method='animate', args=[None, play]),
+                    dict(label="⏸ Pause", method='animate',
+                         args=[[None], dict(frame=dict(duration=0, redraw=False), transition=dict(duration=0), mode='immediate')])
+                ]
+            )],
+            sliders=[dict(
+                active=0,
+                x=0.15, len=0.85, y=0.0, yanchor='top',
+                pad=dict(t=30),
+                currentvalue=dict(prefix="UTC ", font=dict(color='#FFD700')),
+                steps=[dict(label=label, method='animate',
+                            args=[[label], dict(frame=dict(duration=0, redraw=True), transition=dict(duration=0), mode='immediate')])
+                       for label in labels]
+            )]
+        )
+        spec = compact_figure(fig)
+        # The per-frame estimate is approximate; thin further until the spec really fits
+        size = figure_payload_bytes(spec)
+        if size <= byte_budget or len(kept) == 1:
+            break
+        frame_bytes = max(frame_bytes * 1.05, (size - base_bytes) / len(kept))
+        kept = decimate_frames(len(times), frame_bytes, base_bytes, byte_budget)
+
+    return spec, {
+        'objects': len(orbits['name']),
+        'frames': len(kept),
+        'candidate_frames': len(times),
+        'frame_step_hours': float(times[kept[1]] - times[kept[0]]) / 3600 if len(kept) > 1 else 0.0,
+        'bytes': size,
+        'byte_budget': byte_budget,
+        'over_budget': size > byte_budget
+    }
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+# Process-wide: every session reads the snapshots published here, so the
+# request path never waits on the network. Snapshots are replaced whole,
+# never mutated; treat their data as read-only.
+DEFAULT_JITTER = 0.1  # fraction of the interval each wait is randomly stretched or shrunk by
+RETRY_INTERVAL = 60.0  # s, wait after a failed refresh when that is sooner than the interval
+REFRESH_COOLDOWN = 60.0  # s after an attempt starts during which refresh requests are ignored
+ERROR_LENGTH = 200
+QUERY_STRING = re.compile(r"\?[^\s'\")]*")  # URLs in errors may carry API keys
+
+_lock = threading.Lock()
+_sources = {}
+_published = {}
+_stop = threading.Event()
+
+def content_version(payload):
+    """Short content hash identifying one snapshot of a data source"""
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+def _publish(name, payload, live):
+    """Swap in a new snapshot unless the content is unchanged; returns the current version"""
+    version = content_version(payload)
+    with _lock:
+        current = _published.get(name)
+        if current is not None and current['version'] == version:
+            return version
+        _published[name] = {
+            'name': name,
+            'version': version,
+            'data': payload,
+            'live': live,
+            'published_at': time.time()
+        }
+        _sources[name]['stats']['versions_published'] += 1
+    return version
+
+def _next_wait(source, failed):
+    interval = source['interval']
+    if failed:
+        interval = min(interval, RETRY_INTERVAL)
+    return interval * (1 + random.uniform(-source['jitter'], source['jitter']))
+
+def refresh_source(name):
+    """Fetch one source now, publish on success and record the outcome; returns True on success"""
+    source = _sources[name]
+    stats = source['stats']
+    source['attempt_started'] = time.time()
+    start_time = time.perf_counter()
+    try:
+        payload = source['fetch']()
+    except Exception as exc:
+        with _lock:
+            stats['failures'] += 1
+            stats['consecutive_failures'] += 1
+            stats['last_error'] = QUERY_STRING.sub('?…', f"{type(exc).__name__}: {exc}")[:ERROR_LENGTH]
+            stats['last_attempt'] = time.time()
+            stats['last_duration'] = time.perf_counter() - start_time
+        return False
+
+    _publish(name, payload, live=True)
+    with _lock:
+        stats['consecutive_failures'] = 0
+        stats['last_error'] = None
+        stats['last_attempt'] = stats['last_refresh'] = time.time()
+        stats['last_duration'] = time.perf_counter() - start_time
+    return True
+
+def _refresh_loop(name):
+    source = _sources[name]
+    while not _stop.is_set():
+        failed = not refresh_source(name)
+        wait = _next_wait(source, failed)
+        with _lock:
+            source['stats']['next_refresh'] = time.time() + wait
+        # Woken early by request_refresh or stop_scheduler
+        source['wake'].wait(wait)
+        source['wake'].clear()
+
+def register_source(name, fetch, interval, fallback=None, jitter=DEFAULT_JITTER):
+    """Refresh a source in a background thread every interval seconds (± jitter)
+
+    fallback() builds a placeholder snapshot without network I/O so readers
+    have data before the first fetch lands. Registering a name again is a no-op.
+    """
+    with _lock:
+        if name in _sources:
+            return
+        _sources[name] = {
+            'fetch': fetch,
+            'interval': float(interval),
+            'jitter': jitter,
+            'wake': threading.Event(),
+            'attempt_started': None,
+            'stats': {
+                'last_refresh': None,
+                'last_attempt': None,
+                'last_duration': None,
+                'next_refresh': None,
+                'failures': 0,
+                'consecutive_failures': 0,
+                'last_error': None,
+                'versions_published': 0,
+                'requests_ignored': 0
+            }
+        }
+    if fallback is not None:
+        _publish(name, fallback(), live=False)
+    _stop.clear()
+    thread = threading.Thread(target=_refresh_loop, args=(name,), name=f"refresh-{name}", daemon=True)
+    _sources[name]['thread'] = thread
+    thread.start()
+
+def latest(name):
+    """The most recently published snapshot of a source, or None before the first one"""
+    return _published.get(name)
+
+def request_refresh(name=None):
+    """Ask one source (or all) to refresh now, without waiting for the result
+
+    Sources that started an attempt within REFRESH_COOLDOWN are left alone,
+    so repeated clicks cannot hammer the upstream APIs. Returns the number of
+    sources woken.
+    """
+    woken = 0
+    now = time.time()
+    with _lock:
+        for source_name, source in _sources.items():
+            if name is not None and source_name != name:
+                continue
+            started = source['attempt_started']
+            if started is not None and now - started < REFRESH_COOLDOWN:
+                source['stats']['requests_ignored'] += 1
+                continue
+            source['wake'].set()
+            woken += 1
+    return woken
+
+def refresh_stats():
+    """Last refresh time, duration, failure counts and version per source"""
+    with _lock:
+        return {
+            name: {**source['stats'], 'interval': source['interval'],
+                   'version': _published[name]['version'] if name in _published else None,
+                   'live': _published[name]['live'] if name in _published else False}
+            for name, source in _sources.items()
+        }
+
+def stop_scheduler(timeout=5.0):
+    """Stop every refresh thread and forget the registered sources"""
+    _stop.set()
+    for source in list(_sources.values()):
+        source['wake'].set()
+    for source in list(_sources.values()):
+        source['thread'].join(timeout)
+    with _lock:
+        _sources.clear()
+        _published.clear()
@@ -0,0 +1,273 @@
+import base64
+import html
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.image import imread
+from matplotlib.ticker import FuncFormatter, NullFormatter
+
+from neo_search import index_neo_feed
+from refresh_scheduler import content_version
+
+# Chart images render in a small thread pool and are cached per data version.
+# Reports are assembled on one separate thread, so an assembly never holds a
+# pool slot its own charts need. Both caches are process-wide and bounded.
+REPORT_WORKERS = 2
+CHART_CACHE_SIZE = 32
+REPORT_CACHE_SIZE = 16
+CHART_DPI = 110
+LUNAR_DISTANCE = 384400.0  # km
+
+_chart_pool = ThreadPoolExecutor(REPORT_WORKERS, thread_name_prefix="report-chart")
+_assembler = ThreadPoolExecutor(1, thread_name_prefix="report-assembly")
+_lock = threading.Lock()
+_charts = OrderedDict()
+_reports = OrderedDict()
+
+def _remember(cache, key, make, size):
+    """Return the cached future for key, submitting make() on a miss and evicting the oldest entries"""
+    with _lock:
+        cached = cache.get(key)
+        # Failed renders are retried rather than served from the cache
+        if cached is not None and not (cached.done() and cached.exception() is not None):
+            cache.move_to_end(key)
+            return cached
+        future = cache[key] = make()
+        while len(cache) > size:
+            cache.popitem(last=False)
+        return future
+
+def _png(draw, *args):
+    """Render one chart to PNG bytes with the object-oriented Matplotlib API (no pyplot state)"""
+    fig = Figure(figsize=(7, 4), dpi=CHART_DPI)
+    draw(fig.add_subplot(), *args)
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+def _plain_log_axis(axis):
+    """Plain-number log tick labels; the default mathtext labels share a parser that is not thread-safe"""
+    axis.set_major_formatter(FuncFormatter(lambda value, _: f"{value:g}"))
+    axis.set_minor_formatter(NullFormatter())
+
+def _draw_sizes(ax, table):
+    positive = table['diameter'] > 0
+    diameter = table['diameter'][positive]
+    hazardous = table['hazardous'][positive]
+    bins = np.logspace(np.log10(diameter.min()), np.log10(diameter.max()), 25) if diameter.size else 10
+    ax.hist([diameter[~hazardous], diameter[hazardous]], bins=bins, stacked=True,
+            color=['#00b894', '#d63031'], label=['Non-hazardous', 'Hazardous'])
+    ax.set_xscale('log')
+    _plain_log_axis(ax.xaxis)
+    ax.set_xlabel("Diameter (m)")
+    ax.set_ylabel("Objects")
+    ax.set_title("Asteroid Size Distribution")
+    ax.legend()
+
+def _draw_approaches(ax, table):
+    hazardous = table['hazardous']
+    distance = table['miss_distance'] / LUNAR_DISTANCE
+    velocity = table['velocity']
+    size = 8 + 60 * np.sqrt(table['diameter'] / max(table['diameter'].max(initial=0), 1))
+    for mask, color, label in ((~hazardous, '#00b894', 'Non-hazardous'), (hazardous, '#d63031', 'Hazardous')):
+        ax.scatter(distance[mask], velocity[mask], s=size[mask], c=color, alpha=0.6, label=label)
+    ax.set_xscale('log')
+    _plain_log_axis(ax.xaxis)
+    ax.set_xlabel("Miss distance (lunar distances)")
+    ax.set_ylabel("Relative velocity (km/s)")
+    ax.set_title("Close Approaches")
+    ax.legend()
+
+def _draw_earthquakes(ax, earthquakes):
+    magnitude = np.array([eq['magnitude'] for eq in earthquakes], dtype=float)
+    ax.scatter([eq['longitude'] for eq in earthquakes], [eq['latitude'] for eq in earthquakes],
+               s=4 * 2 ** magnitude, c=magnitude, cmap='Reds', edgecolors='#333333', linewidths=0.5)
+    ax.set_xlim(-180, 180)
+    ax.set_ylim(-90, 90)
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+    ax.set_title("Recent Earthquakes (M4.5+)")
+    ax.grid(alpha=0.3)
+
+def _draw_impact(ax, impact):
+    distribution = impact['impact_distribution']
+    ax.pie(list(distribution.values()), labels=list(distribution), autopct='%1.0f%%',
+           colors=['#b2182b', '#ef8a62', '#67a9cf', '#2166ac'], wedgeprops=dict(width=0.6))
+    ax.set_title("Impact Energy Distribution")
+
+def _summary(table, earthquakes):
+    """Headline statistics for the feed and the seismic data"""
+    values = table['values']
+    labels = table['labels']
+    stats = {'objects': table['size'], 'hazardous': int(table['hazardous'][True].sum())}
+    if table['size']:
+        largest = int(np.argmax(values['diameter']))
+        closest = int(np.argmin(values['miss_distance']))
+        fastest = int(np.argmax(values['velocity']))
+        stats.update({
+            'largest': (str(labels[largest]), float(values['diameter'][largest])),
+            'closest': (str(labels[closest]), float(values['miss_distance'][closest])),
+            'fastest': (str(labels[fastest]), float(values['velocity'][fastest]))
+        })
+    if earthquakes:
+        stats['earthquakes'] = len(earthquakes)
+        stats['largest_magnitude'] = max(eq['magnitude'] for eq in earthquakes)
+        stats['mean_depth'] = float(np.mean([eq['depth'] for eq in earthquakes]))
+    return stats
+
+def _summary_lines(stats, snapshots, results):
+    """The report's text as (heading, [(label, value), ...]) sections, shared by HTML and PDF"""
+    neo, usgs = snapshots
+    sections = [("Data Sources", [
+        ("NASA NEO feed", f"{'Live' if neo['live'] else 'Simulated'} · version {neo['version']} · "
+                          f"{datetime.fromtimestamp(neo['published_at']):%Y-%m-%d %H:%M}"),
+        ("USGS earthquakes", f"{'Live' if usgs['live'] else 'Simulated'} · version {usgs['version']} · "
+                             f"{datetime.fromtimestamp(usgs['published_at']):%Y-%m-%d %H:%M}")
+    ])]
+
+    neo_rows = [("Objects tracked", f"{stats['objects']:,}"), ("Potentially hazardous", f"{stats['hazardous']:,}")]
+    if 'largest' in stats:
+        neo_rows += [
+            ("Largest", f"{stats['largest'][0]} · {stats['largest'][1]:,.0f} m"),
+            ("Closest approach", f"{stats['closest'][0]} · {stats['closest'][1]:,.0f} km "
+                                 f"({stats['closest'][1] / LUNAR_DISTANCE:.1f} lunar distances)"),
+            ("Fastest", f"{stats['fastest'][0]} · {stats['fastest'][1]:.1f} km/s")
+        ]
+    sections.append(("Near-Earth Objects", neo_rows))
+
+    if 'earthquakes' in stats:
+        sections.append(("Seismic Activity", [
+            ("Earthquakes", f"{stats['earthquakes']:,}"),
+            ("Largest magnitude", f"{stats['largest_magnitude']:.1f}"),
+            ("Average depth", f"{stats['mean_depth']:.1f} km")
+        ]))
+
+    impact = results.get('impact')
+    if impact:
+        entry = (f"Airburst at {impact['burst_altitude'] / 1000:.1f} km" if impact['airburst']
+                 else f"Ground impact at {impact['residual_velocity']:.1f} km/s")
+        sections.append(("Impact Simulation", [
+            ("Scenario", f"{impact['diameter']:.0f} m {impact['composition']} at {impact['velocity']:.0f} km/s, "
+                         f"{impact['angle']:.0f}° into {impact['material']}"),
+            ("Energy release", f"{impact['energy_megatons']:,.1f} Mt TNT"),
+            ("Atmospheric entry", entry),
+            ("Crater diameter", f"{impact['crater_diameter']:,.0f} m"),
+            ("Seismic magnitude", "—" if np.isnan(impact['seismic_magnitude']) else f"{impact['seismic_magnitude']:.1f}"),
+            ("Fireball radius", f"{impact['fireball_radius']:.1f} km"),
+            ("Affected area", f"{impact['affected_area']:,.0f} km²")
+        ]))
+
+    defense = results.get('defense')
+    if defense:
+        sections.append(("Defense Simulation", [
+            ("Strategy", defense['strategy']),
+            ("Asteroid size", f"{defense['asteroid_size']:.0f} m"),
+            ("Warning time", f"{defense['warning_time']:.0f} years"),
+            ("Success probability", f"{defense['success_rate']:.1%}"),
+            ("Estimated miss distance", f"{defense['miss_distance']:,.0f} km")
+        ]))
+    return sections
+
+def _render_html(title, generated, sections, charts):
+    blocks = []
+    for heading, rows in sections:
+        cells = "".join(f"<tr><th>{html.escape(label)}</th><td>{html.escape(value)}</td></tr>" for label, value in rows)
+        blocks.append(f"<h2>{html.escape(heading)}</h2><table>{cells}</table>")
+    images = "".join(f'<img alt="{html.escape(name)}" src="data:image/png;base64,{base64.b64encode(png).decode()}">'
+                     for name, png in charts)
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 2rem auto; max-width: 900px; color: #222; }}
+header {{ background: #0B3D91; color: white; padding: 1.5rem; border-radius: 10px; border-bottom: 4px solid #FC3D21; }}
+h1 {{ margin: 0; }} h2 {{ color: #0B3D91; border-bottom: 2px solid #FC3D21; padding-bottom: .3rem; }}
+table {{ border-collapse: collapse; width: 100%; }} th, td {{ text-align: left; padding: .35rem .6rem; border-bottom: 1px solid #ddd; }}
+th {{ width: 35%; color: #555; }} img {{ width: 100%; margin: 1rem 0; }}
+</style></head><body>
+<header><h1>🌌 {html.escape(title)}</h1><p>Generated {generated:%Y-%m-%d %H:%M:%S}</p></header>
+{"".join(blocks)}
+<h2>Charts</h2>{images}
+</body></html>""".encode('utf-8')
+
+def _render_pdf(title, generated, sections, charts):
+    buffer = io.BytesIO()
+    with PdfPages(buffer) as pdf:
+        page = Figure(figsize=(8.27, 11.69))
+        page.text(0.08, 0.95, title, fontsize=20, weight='bold', color='#0B3D91')
+        page.text(0.08, 0.925, f"Generated {generated:%Y-%m-%d %H:%M:%S}", fontsize=9, color='#555555')
+        y = 0.88
+        for heading, rows in sections:
+            page.text(0.08, y, heading, fontsize=13, weight='bold', color='#FC3D21')
+            y -= 0.025
+            for label, value in rows:
+                page.text(0.10, y, label, fontsize=9, color='#555555')
+                page.text(0.40, y, value, fontsize=9)
+                y -= 0.02
+            y -= 0.015
+        pdf.savefig(page)
+
+        # Two cached chart images per page
+        for start in range(0, len(charts), 2):
+            page = Figure(figsize=(8.27, 11.69))
+            for slot, (name, png) in enumerate(charts[start:start + 2]):
+                ax = page.add_axes([0.05, 0.52 - 0.47 * slot, 0.9, 0.43])
+                ax.imshow(imread(io.BytesIO(png), format='png'))
+                ax.set_axis_off()
+            pdf.savefig(page)
+    return buffer.getvalue()
+
+def _chart_futures(neo_snapshot, usgs_snapshot, results, index):
+    """Cached (or newly submitted) chart renders for this report, as (title, future) pairs"""
+    # Charts only see the plotted columns, not the whole index
+    table = {column: index['values'][column] for column in ('diameter', 'miss_distance', 'velocity')}
+    table['hazardous'] = index['hazardous'][True]
+    earthquakes = [{key: eq[key] for key in ('magnitude', 'longitude', 'latitude', 'depth')}
+                   for eq in usgs_snapshot['data']]
+    chart_futures = [
+        ("Asteroid Size Distribution", _remember(_charts, (neo_snapshot['version'], 'sizes'),
+                                                 lambda: _chart_pool.submit(_png, _draw_sizes, table), CHART_CACHE_SIZE)),
+        ("Close Approaches", _remember(_charts, (neo_snapshot['version'], 'approaches'),
+                                       lambda: _chart_pool.submit(_png, _draw_approaches, table), CHART_CACHE_SIZE))
+    ]
+    if earthquakes:
+        chart_futures.append(("Recent Earthquakes", _remember(
+            _charts, (usgs_snapshot['version'], 'earthquakes'),
+            lambda: _chart_pool.submit(_png, _draw_earthquakes, earthquakes), CHART_CACHE_SIZE)))
+    if results.get('impact'):
+        chart_futures.append(("Impact Energy Distribution", _remember(
+            _charts, (content_version(results['impact']), 'impact'),
+            lambda: _chart_pool.submit(_png, _draw_impact, results['impact']), CHART_CACHE_SIZE)))
+    return chart_futures, earthquakes
+
+def _assemble(title, neo_snapshot, usgs_snapshot, results):
+    """Index the feed, collect the charts and render both formats; runs on the assembler thread"""
+    index = index_neo_feed(neo_snapshot['data']['data'])
+    chart_futures, earthquakes = _chart_futures(neo_snapshot, usgs_snapshot, results, index)
+    sections = _summary_lines(_summary(index, earthquakes), (neo_snapshot, usgs_snapshot), results)
+    charts = [(name, future.result()) for name, future in chart_futures]
+    generated = datetime.now()
+    return {
+        'html': _render_html(title, generated, sections, charts),
+        'pdf': _render_pdf(title, generated, sections, charts),
+        'generated': generated
+    }
+
+def request_report(neo_snapshot, usgs_snapshot, results, title="Meteor Madness Planetary Defense Report"):
+    """Start (or reuse) a report for these data versions and results; returns (key, future)
+
+    The future resolves to {'html': bytes, 'pdf': bytes, 'generated': datetime}.
+    Charts are cached per data version, whole reports per data versions plus
+    results, so a repeated request for unchanged inputs is already done. Only
+    the cache key is computed here; everything else runs in the background.
+    """
+    key = (neo_snapshot['version'], usgs_snapshot['version'], content_version(results))
+    future = _remember(_reports, key, lambda: _assembler.submit(
+        _assemble, title, neo_snapshot, usgs_snapshot, results), REPORT_CACHE_SIZE)
+    return key, future
@@ -0,0 +1,83 @@
+import random
+import zlib
+from functools import lru_cache
+
+import pandas as pd
+import plotly.express as px
+
+from charts import compact_figure
+from impact_models import calculate_defense_success, calculate_impact_with_entry
+
+# Process-wide caches, shared by every session. lru_cache is thread-safe, bounded
+# and keeps hit/miss counts; cached results are shared, so treat them as read-only.
+IMPACT_CACHE_SIZE = 512
+DEFENSE_CACHE_SIZE = 256
+FIGURE_CACHE_SIZE = 256
+
+# Quantization step per parameter; results are computed at the quantized values
+DIAMETER_STEP = 1.0  # m
+VELOCITY_STEP = 0.1  # km/s
+ANGLE_STEP = 1.0  # degrees
+WARNING_STEP = 0.1  # years
+
+def quantize(value, step):
+    """Snap a value to the nearest multiple of step"""
+    return round(round(float(value) / step) * step, 6)
+
+def _impact_key(diameter, velocity, angle, material, density):
+    return (quantize(diameter, DIAMETER_STEP), quantize(velocity, VELOCITY_STEP),
+            quantize(angle, ANGLE_STEP), material, float(density))
+
+@lru_cache(maxsize=IMPACT_CACHE_SIZE)
+def _cached_impact(diameter, velocity, angle, material, density):
+    return calculate_impact_with_entry(diameter, velocity, angle, material, density, return_profile=True)
+
+@lru_cache(maxsize=DEFENSE_CACHE_SIZE)
+def _cached_defense(defense_strategy, asteroid_size, warning_time):
+    # Seed the miss-distance draw from the key so a cached result is the result
+    seed = zlib.crc32(repr((defense_strategy, asteroid_size, warning_time)).encode())
+    return calculate_defense_success(defense_strategy, asteroid_size, warning_time, random.Random(seed))
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def _cached_distribution_figure(diameter, velocity, angle, material, density):
+    impact_results = _cached_impact(diameter, velocity, angle, material, density)
+    impact_dist_df = pd.DataFrame({
+        'Effect': list(impact_results['impact_distribution'].keys()),
+        'Percentage': list(impact_results['impact_distribution'].values())
+    })
+    fig = px.pie(
+        impact_dist_df,
+        values='Percentage',
+        names='Effect',
+        hole=0.4,
+        color_discrete_sequence=px.colors.sequential.RdBu
+    )
+    return compact_figure(fig)
+
+def cached_impact_with_entry(diameter, velocity, angle, material, density):
+    """Memoized entry and impact results for the quantized parameter tuple"""
+    return _cached_impact(*_impact_key(diameter, velocity, angle, material, density))
+
+def cached_defense_success(defense_strategy, asteroid_size, warning_time):
+    """Memoized defense outcome, deterministic per quantized parameter tuple"""
+    return _cached_defense(defense_strategy, quantize(asteroid_size, DIAMETER_STEP), quantize(warning_time, WARNING_STEP))
+
+def cached_impact_distribution_figure(diameter, velocity, angle, material, density):
+    """Memoized compact spec of the impact energy distribution pie"""
+    return _cached_distribution_figure(*_impact_key(diameter, velocity, angle, material, density))
+
+def cache_stats():
+    """Hit/miss counters and occupancy for each result cache"""
+    stats = {}
+    for name, cached in (('Impact', _cached_impact), ('Defense', _cached_defense),
+                         ('Impact Figure', _cached_distribution_figure)):
+        info = cached.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+            'size': info.currsize,
+            'max_size': info.maxsize
+        }
+    return stats
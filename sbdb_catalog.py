@@ -0,0 +1,268 @@
+"""Streaming loader for JPL Small-Body Database bulk exports
+
+python sbdb_catalog.py export.csv catalog.npy [--pha-only]
+"""
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from impact_models import calculate_impact_effects
+
+CHUNK_ROWS = 100000
+READ_BLOCK = 1 << 20  # bytes per read while streaming JSON
+DEFAULT_ALBEDO = 0.14
+NEO_PERIHELION = 1.3  # AU, perihelion limit for near-Earth objects
+EARTH_ORBITAL_SPEED = 29.78  # km/s
+EARTH_ESCAPE_VELOCITY = 11.19  # km/s
+
+CATALOG_DTYPE = np.dtype([
+    ('name', 'S32'),
+    ('a', 'f4'),  # semi-major axis, AU
+    ('e', 'f4'),
+    ('i', 'f4'),  # inclination, degrees
+    ('om', 'f4'),  # longitude of ascending node, degrees
+    ('w', 'f4'),  # argument of perihelion, degrees
+    ('ma', 'f4'),  # mean anomaly at epoch, degrees
+    ('epoch', 'f8'),  # Julian date
+    ('H', 'f4'),
+    ('diameter', 'f4'),  # m
+    ('albedo', 'f4'),
+    ('diameter_estimated', '?'),
+    ('pha', '?')
+])
+
+NUMERIC_FIELDS = ['a', 'e', 'i', 'om', 'w', 'ma', 'epoch', 'H', 'diameter', 'albedo', 'q']
+TEXT_FIELDS = ['full_name', 'pdes', 'neo', 'pha']
+
+def _chunk_to_records(df, pha_only):
+    """Filter one chunk to NEOs (or PHAs) and pack it into catalog records"""
+    numeric = {field: pd.to_numeric(df[field], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+               if field in df else np.full(len(df), np.nan) for field in NUMERIC_FIELDS}
+    perihelion = np.where(np.isnan(numeric['q']), numeric['a'] * (1 - numeric['e']), numeric['q'])
+
+    if 'neo' in df:
+        neo = df['neo'].to_numpy() == 'Y'
+    else:
+        neo = perihelion < NEO_PERIHELION
+    pha = df['pha'].to_numpy() == 'Y' if 'pha' in df else np.zeros(len(df), dtype=bool)
+    keep = pha if pha_only else neo
+
+    records = np.zeros(int(keep.sum()), dtype=CATALOG_DTYPE)
+    if not len(records):
+        return records
+
+    names = df['full_name'] if 'full_name' in df else df.get('pdes', pd.Series([''] * len(df)))
+    records['name'] = names[keep].astype(str).str.strip().str.encode('ascii', 'replace').to_numpy()
+    for field in ('a', 'e', 'i', 'om', 'w', 'ma', 'epoch', 'H'):
+        records[field] = numeric[field][keep]
+
+    albedo = numeric['albedo'][keep]
+    albedo = np.where(np.isnan(albedo), DEFAULT_ALBEDO, albedo)
+    # SBDB diameters are in km; fill gaps from H and albedo (D = 1329 km / sqrt(p) * 10^(-H/5))
+    diameter = numeric['diameter'][keep] * 1000
+    estimated = np.isnan(diameter)
+    diameter[estimated] = 1329e3 / np.sqrt(albedo[estimated]) * 10 ** (-numeric['H'][keep][estimated] / 5)
+
+    records['diameter'] = diameter
+    records['albedo'] = albedo
+    records['diameter_estimated'] = estimated
+    records['pha'] = pha[keep]
+    return records
+
+def _iter_csv_chunks(path, chunk_rows):
+    """Yield DataFrame chunks of a CSV export, reading only the columns the catalog uses"""
+    wanted = set(NUMERIC_FIELDS) | set(TEXT_FIELDS)
+    yield from pd.read_csv(path, chunksize=chunk_rows, usecols=lambda column: column in wanted,
+                           dtype={field: str for field in TEXT_FIELDS}, skipinitialspace=True)
+
+def _iter_json_chunks(path, chunk_rows):
+    """Yield DataFrame chunks of an SBDB Query API JSON export without parsing it whole
+
+    The export is {"fields": [...], "data": [[...], ...]}; "fields" must come first.
+    """
+    decoder = json.JSONDecoder()
+    fields = None
+    rows = []
+    buffer = ''
+    pos = 0
+    in_data = False
+
+    with open(path, encoding='utf-8') as f:
+        def fill():
+            nonlocal buffer, pos
+            block = f.read(READ_BLOCK)
+            buffer = buffer[pos:] + block
+            pos = 0
+            return bool(block)
+
+        eof = not fill()
+        while True:
+            if not in_data:
+                # Look for the "fields" list, then the start of the "data" list
+                key = '"fields"' if fields is None else '"data"'
+                found = buffer.find(key, pos)
+                if found < 0:
+                    if eof:
+                        break
+                    pos = max(pos, len(buffer) - len(key))
+                    eof = not fill()
+                    continue
+                start = buffer.find('[', found)
+                if start < 0:
+                    eof = not fill()
+                    continue
+                if fields is None:
+                    try:
+                        fields, end = decoder.raw_decode(buffer, start)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        eof = not fill()
+                        continue
+                    pos = end
+                else:
+                    pos = start + 1
+                    in_data = True
+                continue
+
+            # Inside "data": skip separators, stop at the closing bracket, decode one row at a time
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer) - 1 and not eof:
+                eof = not fill()
+                continue
+            if pos < len(buffer) and buffer[pos] == ']':
+                break
+            try:
+                row, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                eof = not fill()
+                continue
+            rows.append(row)
+            pos = end
+            if len(rows) >= chunk_rows:
+                yield pd.DataFrame(rows, columns=fields)
+                rows = []
+
+    if fields is None:
+        raise ValueError(f"{path}: no \"fields\" list found before \"data\"")
+    if rows:
+        yield pd.DataFrame(rows, columns=fields)
+
+def build_catalog(source, output, chunk_rows=CHUNK_ROWS, pha_only=False):
+    """Stream an SBDB CSV or JSON export into a memory-mappable .npy catalog
+
+    Only one chunk of rows is ever held as Python objects; packed records are
+    appended to a scratch file and given an .npy header at the end.
+    """
+    start_time = time.perf_counter()
+    chunks = _iter_json_chunks if str(source).lower().endswith('.json') else _iter_csv_chunks
+    rows_read = rows_kept = 0
+    scratch = f"{output}.part"
+
+    with open(scratch, 'wb') as raw:
+        for df in chunks(source, chunk_rows):
+            records = _chunk_to_records(df, pha_only)
+            raw.write(records.tobytes())
+            rows_read += len(df)
+            rows_kept += len(records)
+
+    with open(output, 'wb') as out, open(scratch, 'rb') as raw:
+        np.lib.format.write_array_header_1_0(out, {
+            'descr': np.lib.format.dtype_to_descr(CATALOG_DTYPE),
+            'fortran_order': False,
+            'shape': (rows_kept,)
+        })
+        shutil.copyfileobj(raw, out)
+    os.remove(scratch)
+
+    seconds = time.perf_counter() - start_time
+    return {
+        'rows_read': rows_read,
+        'rows_kept': rows_kept,
+        'seconds': seconds,
+        'rows_per_sec': rows_read / seconds if seconds else float('inf'),
+        'bytes': os.path.getsize(output)
+    }
+
+def load_catalog(path):
+    """Memory-map a catalog, building it first from a raw export if needed"""
+    if not str(path).endswith('.npy'):
+        built = os.path.splitext(path)[0] + '.npy'
+        if not os.path.exists(built) or os.path.getmtime(built) < os.path.getmtime(path):
+            build_catalog(path, built)
+        path = built
+    return np.load(path, mmap_mode='r')
+
+def catalog_summary(catalog):
+    """Headline counts and size statistics"""
+    diameter = np.asarray(catalog['diameter'], dtype=float)
+    return {
+        'objects': len(catalog),
+        'pha': int(np.count_nonzero(catalog['pha'])),
+        'measured_diameters': int(np.count_nonzero(~catalog['diameter_estimated'])),
+        'larger_than_1km': int(np.count_nonzero(diameter >= 1000)),
+        'larger_than_140m': int(np.count_nonzero(diameter >= 140)),
+        'median_diameter': float(np.nanmedian(diameter)) if len(catalog) else float('nan')
+    }
+
+def encounter_velocity(catalog):
+    """Earth-impact speed (km/s) from the orbit's encounter speed (Öpik) plus escape velocity"""
+    a = np.asarray(catalog['a'], dtype=float)
+    e = np.asarray(catalog['e'], dtype=float)
+    i = np.radians(np.asarray(catalog['i'], dtype=float))
+    # Tisserand-based speed relative to Earth on a circular 1 AU orbit
+    u_squared = 3 - 1 / a - 2 * np.sqrt(np.clip(a * (1 - e ** 2), 0, None)) * np.cos(i)
+    v_infinity = EARTH_ORBITAL_SPEED * np.sqrt(np.clip(u_squared, 0, None))
+    return np.sqrt(v_infinity ** 2 + EARTH_ESCAPE_VELOCITY ** 2)
+
+def catalog_impact_effects(catalog, material="Continental Crust", angle=45):
+    """Impact effects for every catalog object as if it struck Earth"""
+    diameter = np.asarray(catalog['diameter'], dtype=float)
+    return calculate_impact_effects(diameter, encounter_velocity(catalog), np.full(diameter.shape, angle), material)
+
+def solve_kepler(mean_anomaly, e, iterations=8):
+    """Eccentric anomaly for arrays of mean anomalies (radians) by Newton iteration"""
+    E = np.where(e < 0.8, mean_anomaly, np.pi * np.ones_like(mean_anomaly))
+    for _ in range(iterations):
+        E = E - (E - e * np.sin(E) - mean_anomaly) / (1 - e * np.cos(E))
+    return E
+
+def orbit_positions(catalog, mean_anomaly):
+    """Heliocentric ecliptic positions (AU) for each object at the given mean anomalies
+
+    mean_anomaly is in degrees and broadcasts against the catalog, e.g. shape
+    (objects, samples) to trace whole orbits in one pass.
+    """
+    a = np.asarray(catalog['a'], dtype=float)[:, None]
+    e = np.asarray(catalog['e'], dtype=float)[:, None]
+    i = np.radians(np.asarray(catalog['i'], dtype=float))[:, None]
+    om = np.radians(np.asarray(catalog['om'], dtype=float))[:, None]
+    w = np.radians(np.asarray(catalog['w'], dtype=float))[:, None]
+
+    E = solve_kepler(np.radians(np.asarray(mean_anomaly, dtype=float)) % (2 * np.pi), e)
+    # Position in the orbital plane, then rotated by w, i and om
+    xp = a * (np.cos(E) - e)
+    yp = a * np.sqrt(1 - e ** 2) * np.sin(E)
+    cos_w, sin_w = np.cos(w), np.sin(w)
+    cos_om, sin_om = np.cos(om), np.sin(om)
+    cos_i, sin_i = np.cos(i), np.sin(i)
+    x = (cos_om * cos_w - sin_om * sin_w * cos_i) * xp + (-cos_om * sin_w - sin_om * cos_w * cos_i) * yp
+    y = (sin_om * cos_w + cos_om * sin_w * cos_i) * xp + (-sin_om * sin_w + cos_om * cos_w * cos_i) * yp
+    z = (sin_w * sin_i) * xp + (cos_w * sin_i) * yp
+    return x, y, z
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(args) != 2:
+        sys.exit(__doc__.strip())
+    stats = build_catalog(args[0], args[1], pha_only='--pha-only' in sys.argv)
+    print(f"{stats['rows_read']:,} rows read, {stats['rows_kept']:,} kept in {stats['seconds']:.1f} s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec, {stats['bytes'] / 1e6:,.1f} MB)")
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+SEISMIC_REGIONS = [
+    ("California, USA", 36.7783, -119.4179),
+    ("Tokyo, Japan", 35.6762, 139.6503),
+    ("Indonesia", -0.7893, 113.9213),
+    ("Chile", -35.6751, -71.5430),
+    ("Italy", 41.8719, 12.5674),
+    ("New Zealand", -40.9006, 174.8860),
+    ("Greece", 39.0742, 21.8243),
+    ("Turkey", 38.9637, 35.2433),
+    ("Mexico", 23.6345, -102.5528),
+    ("Philippines", 12.8797, 121.7740),
+    ("Alaska, USA", 64.2008, -149.4937),
+    ("Peru", -9.1900, -75.0152),
+    ("India", 20.5937, 78.9629),
+    ("Iran", 32.4279, 53.6880),
+    ("Papua New Guinea", -6.3150, 143.9555)
+]
+
+def synthetic_neo_feed(count, days=7, start=None, seed=None):
+    """NASA NEO feed-shaped dict with count objects spread over days, drawn in one vectorized pass
+
+    Diameters follow a power law (many small, few large objects); about 7%
+    of objects are flagged potentially hazardous.
+    """
+    rng = np.random.default_rng(seed)
+    start = (start or datetime.now(timezone.utc)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # Cumulative size distribution N(>D) ∝ D^-2 between 10 m and 2 km
+    diameter_min = 10.0 * (1 - rng.random(count) * (1 - (10.0 / 2000.0) ** 2)) ** -0.5
+    hazardous = rng.random(count) < 0.07
+    miss_distance = 10 ** rng.uniform(5.5, 7.9, count)  # km, ~0.8 lunar distances to 0.5 AU
+    velocity = rng.gamma(6.0, 2.8, count) + 2.0  # km/s
+    day = np.sort(rng.integers(0, days, count))
+    approach_ms = ((start.timestamp() + day * 86400 + rng.uniform(0, 86400, count)) * 1000).astype(np.int64)
+    # Provisional designations like (2019 KT12); letters skip I as the MPC's do
+    letters = np.array(list("ABCDEFGHJKLMNOPQRSTUVWXYZ"))
+    year = rng.integers(1990, 2026, count)
+    half_month = letters[rng.integers(0, 24, count)]
+    order = letters[rng.integers(0, 25, count)]
+    cycle = rng.integers(0, 200, count)
+    dates = [(start + timedelta(days=int(d))).strftime('%Y-%m-%d') for d in range(days)]
+
+    feed = {date: [] for date in dates}
+    # Python lists make the per-object dict assembly several times faster than NumPy scalars
+    columns = zip(day.tolist(), year.tolist(), half_month.tolist(), order.tolist(), cycle.tolist(),
+                  diameter_min.tolist(), hazardous.tolist(), approach_ms.tolist(), miss_distance.tolist(), velocity.tolist())
+    for k, (d, y, h, o, c, diameter, pha, approach, distance, speed) in enumerate(columns):
+        date = dates[d]
+        feed[date].append({
+            'id': str(3000000 + k),
+            'name': f"({y} {h}{o}{c or ''})",
+            'estimated_diameter': {'meters': {
+                'estimated_diameter_min': diameter,
+                'estimated_diameter_max': diameter * 5 ** 0.5
+            }},
+            'is_potentially_hazardous_asteroid': pha,
+            'close_approach_data': [{
+                'close_approach_date': date,
+                'epoch_date_close_approach': approach,
+                'miss_distance': {'kilometers': f"{distance:.3f}"},
+                'relative_velocity': {'kilometers_per_second': f"{speed:.6f}"}
+            }]
+        })
+    return {'element_count': count, 'near_earth_objects': feed}
+
+def synthetic_usgs_feed(count, days=7, end=None, seed=None):
+    """USGS GeoJSON summary-feed-shaped dict with count M4.5+ events, newest first
+
+    Magnitudes follow Gutenberg-Richter (b = 1) above 4.5; events scatter
+    around the regions in SEISMIC_REGIONS.
+    """
+    rng = np.random.default_rng(seed)
+    end = end or datetime.now(timezone.utc)
+
+    magnitude = np.round(4.5 + rng.exponential(1 / np.log(10), count), 1)
+    region = rng.integers(0, len(SEISMIC_REGIONS), count)
+    names, lat, lon = zip(*SEISMIC_REGIONS)
+    latitude = np.clip(np.array(lat)[region] + rng.normal(0, 2, count), -90, 90)
+    longitude = (np.array(lon)[region] + rng.normal(0, 2, count) + 180) % 360 - 180
+    depth = np.round(rng.gamma(1.5, 25, count) + 2, 1)
+    time_ms = np.sort((end.timestamp() - rng.uniform(0, days * 86400, count)) * 1000).astype(np.int64)[::-1]
+    significance = np.round(100 * magnitude ** 2 / 6.5).astype(int)
+    offset_km = rng.integers(5, 150, count)
+
+    columns = zip(magnitude.tolist(), offset_km.tolist(), region.tolist(), time_ms.tolist(), significance.tolist(),
+                  longitude.tolist(), latitude.tolist(), depth.tolist())
+    return {
+        'type': 'FeatureCollection',
+        'metadata': {'count': count, 'title': 'USGS Magnitude 4.5+ Earthquakes, Past Week (synthetic)'},
+        'features': [{
+            'type': 'Feature',
+            'properties': {'mag': mag, 'place': f"{offset} km of {names[r]}", 'time': t, 'sig': sig},
+            'geometry': {'type': 'Point', 'coordinates': [x, y, z]},
+            'id': f"syn{k:08d}"
+        } for k, (mag, offset, r, t, sig, x, y, z) in enumerate(columns)]
+    }